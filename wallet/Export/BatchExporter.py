@@ -0,0 +1,189 @@
+import hashlib
+import itertools
+import json
+import os
+from collections import deque
+from contextlib import suppress
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Iterable, NamedTuple, Optional, Tuple, Union
+
+from .Sink import Sink
+
+INDEX_NAME = "index.jsonl"
+
+Item = Tuple[str, Union[bytes, BytesIO, object]]
+
+
+class ExportResult(NamedTuple):
+    """Outcome of an export"""
+
+    written: int  # passes written by this run
+    skipped: int  # passes already written by a previous run
+    finished: bool
+
+
+class BatchExporter:
+    """
+    Streams generated passes into a Sink with bounded memory
+
+    At most max_pending passes are created but not yet written, the
+    iterable of passes is only advanced when there is room, which
+    throttles the generating stage to the speed of the sink. Every
+    written pass gets a line in the index file and every
+    checkpoint_every passes a checkpoint is saved, an interrupted export
+    continues after the last checkpoint when run again with the same,
+    identically ordered, passes.
+    """
+
+    def __init__(
+        self,
+        sink: Sink,
+        index: str,
+        checkpoint: Optional[str] = None,
+        workers: int = 1,
+        max_pending: int = 64,
+        checkpoint_every: int = 1000,
+        index_name: Optional[str] = INDEX_NAME,
+    ) -> None:
+        """
+        :param sink: TarSink, ZipSink, ObjectStoreSink or own Sink
+        :param index: Path of the index file, one json line per pass
+            with name, size, sha1 and its location in the sink
+        :param checkpoint: Path of the checkpoint file, Default no resume
+        :param workers: Threads creating and signing passes
+        :param max_pending: Created passes held in memory at most
+        :param checkpoint_every: Passes between checkpoints
+        :param index_name: Name of the index in the sink when finished,
+            None to keep it out of the sink
+        """
+        if max_pending < 1 or workers < 1 or checkpoint_every < 1:
+            raise ValueError(
+                "workers, max_pending and checkpoint_every must be positive"
+            )
+        self.sink = sink
+        self.index = index
+        self.checkpoint = checkpoint
+        self.workers = workers
+        self.max_pending = max(max_pending, workers)
+        self.checkpoint_every = checkpoint_every
+        self.index_name = index_name
+
+    def load_checkpoint(self) -> Optional[dict]:
+        """Saved checkpoint, None without one"""
+        if not self.checkpoint or not os.path.exists(self.checkpoint):
+            return None
+        with open(self.checkpoint) as file_handle:
+            return json.load(file_handle)
+
+    def _save_checkpoint(self, state: dict) -> None:
+        if not self.checkpoint:
+            return
+        temporary = f"{self.checkpoint}.tmp"
+        with open(temporary, "w") as file_handle:
+            json.dump(state, file_handle)
+            file_handle.flush()
+            os.fsync(file_handle.fileno())
+        os.replace(temporary, self.checkpoint)
+
+    def export(self, passes: Iterable[Item], **create_kwargs) -> ExportResult:
+        """
+        Export passes
+
+        :param passes: Iterable of (name, pass) where pass is a
+            wallet.Pass or the bytes of a created pass
+        :param create_kwargs: Arguments of Pass.create, e.g. signer
+        """
+        state = self.load_checkpoint()
+        if state and state.get("finished"):
+            return ExportResult(0, state["completed"], True)
+        completed = state["completed"] if state else 0
+
+        index = open(self.index, "r+b" if state else "wb")
+        try:
+            if state:
+                index.truncate(state["index_offset"])
+                index.seek(state["index_offset"])
+            self.sink.open(state["sink"] if state else None)
+            try:
+                written = self._run(
+                    itertools.islice(passes, completed, None),
+                    completed,
+                    index,
+                    create_kwargs,
+                )
+            except BaseException:
+                # A resume drops whatever follows the checkpoint
+                with suppress(Exception):
+                    self.sink.close()
+                raise
+            index.flush()
+            if self.index_name:
+                self.sink.write_file(self.index_name, self.index)
+            self.sink.close()
+        finally:
+            index.close()
+        self._save_checkpoint(
+            {"completed": completed + written, "finished": True}
+        )
+        return ExportResult(written, completed, True)
+
+    def _run(self, passes, completed, index, create_kwargs) -> int:
+        written = 0
+
+        def checkpoint():
+            index.flush()
+            self._save_checkpoint(
+                {
+                    "completed": completed + written,
+                    "index_offset": index.tell(),
+                    "sink": self.sink.state(),
+                    "finished": False,
+                }
+            )
+
+        def write(name, data):
+            nonlocal written
+            location = self.sink.write(name, data)
+            entry = {
+                "name": name,
+                "size": len(data),
+                "sha1": hashlib.sha1(data).hexdigest(),
+            }
+            entry.update(location)
+            index.write(json.dumps(entry).encode("utf-8") + b"\n")
+            written += 1
+            if (completed + written) % self.checkpoint_every == 0:
+                checkpoint()
+
+        pending = deque()
+        with ThreadPoolExecutor(
+            self.workers, thread_name_prefix="wallet-export"
+        ) as executor:
+            try:
+                for name, item in passes:
+                    pending.append(
+                        (name, executor.submit(_render, item, create_kwargs))
+                    )
+                    # Back pressure, wait for the sink before pulling more
+                    while len(pending) >= self.max_pending:
+                        name, future = pending.popleft()
+                        write(name, future.result())
+                while pending:
+                    name, future = pending.popleft()
+                    write(name, future.result())
+            except BaseException:
+                for _, future in pending:
+                    future.cancel()
+                # Keep the passes written so far
+                checkpoint()
+                raise
+        return written
+
+
+def _render(item, create_kwargs) -> bytes:
+    if isinstance(item, bytes):
+        return item
+    if isinstance(item, BytesIO):
+        return item.getvalue()
+    return item.create(file_name=BytesIO(), **create_kwargs).getvalue()
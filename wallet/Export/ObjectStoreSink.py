@@ -0,0 +1,96 @@
+import os
+import shutil
+import tempfile
+from abc import ABC, abstractmethod
+
+from .Sink import Sink
+
+
+class ObjectStore(ABC):
+    """
+    Minimal object store interface, adapt S3 or MinIO clients
+    by implementing put and put_file
+    """
+
+    @abstractmethod
+    def put(self, key: str, data: bytes) -> None:
+        """Store an object"""
+
+    def put_file(self, key: str, path: str) -> None:
+        """Store an object from a file"""
+        with open(path, "rb") as file_handle:
+            self.put(key, file_handle.read())
+
+
+class LocalObjectStore(ObjectStore):
+    """
+    Object store on the local filesystem, keys are paths below root,
+    objects appear atomically like in a bucket
+    """
+
+    def __init__(self, root: str) -> None:
+        """
+        :param root: Directory of the bucket
+        """
+        self.root = root
+
+    def path(self, key: str) -> str:
+        """Filesystem path of a key"""
+        path = os.path.normpath(os.path.join(self.root, key))
+        if os.path.commonpath([self.root, path]) != os.path.normpath(self.root):
+            raise ValueError(f"Key {key} is outside of the store")
+        return path
+
+    def _atomic_write(self, key: str, write) -> None:
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        file_handle = tempfile.NamedTemporaryFile(
+            dir=os.path.dirname(path), delete=False
+        )
+        try:
+            with file_handle:
+                write(file_handle)
+            os.replace(file_handle.name, path)
+        except BaseException:
+            os.unlink(file_handle.name)
+            raise
+
+    def put(self, key: str, data: bytes) -> None:
+        self._atomic_write(key, lambda target: target.write(data))
+
+    def put_file(self, key: str, path: str) -> None:
+        def copy(target):
+            with open(path, "rb") as source:
+                shutil.copyfileobj(source, target)
+
+        self._atomic_write(key, copy)
+
+    def get(self, key: str) -> bytes:
+        """Read an object"""
+        with open(self.path(key), "rb") as file_handle:
+            return file_handle.read()
+
+
+class ObjectStoreSink(Sink):
+    """
+    Writes every pass as an object, rewriting an object on resume is
+    harmless so no state is needed
+    """
+
+    def __init__(self, store: ObjectStore, prefix: str = "") -> None:
+        """
+        :param store: ObjectStore to write to
+        :param prefix: Prefix of the keys, e.g. event-42/
+        """
+        self.store = store
+        self.prefix = prefix
+
+    def write(self, name: str, data: bytes) -> dict:
+        key = self.prefix + name
+        self.store.put(key, data)
+        return {"key": key}
+
+    def write_file(self, name: str, path: str) -> dict:
+        key = self.prefix + name
+        self.store.put_file(key, path)
+        return {"key": key}
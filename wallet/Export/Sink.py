@@ -0,0 +1,41 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class Sink(ABC):
+    """
+    Destination of exported passes
+
+    A sink writes passes one by one, state returns what is needed to
+    continue after the last written pass when an export is resumed.
+    """
+
+    def open(self, state: Optional[dict] = None) -> None:
+        """
+        Start writing
+        :param state: Result of state when resuming, None for a new export
+        """
+
+    @abstractmethod
+    def write(self, name: str, data: bytes) -> dict:
+        """
+        Write a pass, returns its location for the index
+        :param name: Name of the pass in the sink
+        :param data: .pkpass content
+        """
+
+    def write_file(self, name: str, path: str) -> dict:
+        """
+        Write a file from disk, e.g. the index
+        :param name: Name of the file in the sink
+        :param path: Path of the file
+        """
+        with open(path, "rb") as file_handle:
+            return self.write(name, file_handle.read())
+
+    def state(self) -> dict:
+        """Flush written passes and return the state to resume from"""
+        return {}
+
+    def close(self) -> None:
+        """Finish the sink"""
@@ -0,0 +1,71 @@
+import os
+import tarfile
+import time
+from io import BytesIO
+from typing import Optional
+
+from .Sink import Sink
+
+
+class TarSink(Sink):
+    """
+    Writes passes into an uncompressed tar archive
+    """
+
+    def __init__(self, path: str, mtime: Optional[float] = None) -> None:
+        """
+        :param path: Path of the tar archive
+        :param mtime: Modification time of the members, Default now
+        """
+        self.path = path
+        self.mtime = mtime
+        self._file = None
+        self._tar = None
+        self._end = 0
+
+    def open(self, state: Optional[dict] = None) -> None:
+        if state:
+            # Drop whatever was written after the checkpoint
+            self._file = open(self.path, "r+b")
+            self._file.truncate(state["offset"])
+            self._file.seek(state["offset"])
+        else:
+            self._file = open(self.path, "wb")
+        # Writing starts at the current position of the file
+        self._tar = tarfile.TarFile(fileobj=self._file, mode="w")
+        self._end = self._tar.offset
+        if self.mtime is None:
+            self.mtime = time.time()
+
+    def _member(self, name: str, size: int) -> tarfile.TarInfo:
+        info = tarfile.TarInfo(name)
+        info.size = size
+        info.mtime = self.mtime
+        info.mode = 0o644
+        return info
+
+    def write(self, name: str, data: bytes) -> dict:
+        offset = self._tar.offset
+        self._tar.addfile(self._member(name, len(data)), BytesIO(data))
+        self._end = self._tar.offset
+        return {"offset": offset}
+
+    def write_file(self, name: str, path: str) -> dict:
+        offset = self._tar.offset
+        with open(path, "rb") as file_handle:
+            size = os.fstat(file_handle.fileno()).st_size
+            self._tar.addfile(self._member(name, size), file_handle)
+        self._end = self._tar.offset
+        return {"offset": offset}
+
+    def state(self) -> dict:
+        # End of the last complete member, a failed write may have
+        # left a partial one behind
+        self._file.flush()
+        return {"offset": self._end}
+
+    def close(self) -> None:
+        try:
+            self._tar.close()
+        finally:
+            self._file.close()
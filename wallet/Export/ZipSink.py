@@ -0,0 +1,162 @@
+import os
+import shutil
+import struct
+import time
+import zipfile
+from typing import List, Optional, Tuple
+
+from .Sink import Sink
+
+ZIP64_EXTRA = 0x0001
+LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+LOCAL_HEADER_SIGNATURE = b"PK\003\004"
+
+
+def _dos_date_time(date: int, dos_time: int) -> Tuple[int, ...]:
+    return (
+        (date >> 9) + 1980,
+        (date >> 5) & 0xF,
+        date & 0x1F,
+        dos_time >> 11,
+        (dos_time >> 5) & 0x3F,
+        (dos_time & 0x1F) * 2,
+    )
+
+
+def _zip64_sizes(extra: bytes, file_size: int, compress_size: int):
+    """Sizes stored in the zip64 extra field of a local header"""
+    position = 0
+    while position + 4 <= len(extra):
+        header_id, length = struct.unpack("<HH", extra[position:position + 4])
+        if header_id == ZIP64_EXTRA:
+            values = list(
+                struct.unpack(
+                    f"<{length // 8}Q", extra[position + 4:position + 4 + length]
+                )
+            )
+            if file_size == 0xFFFFFFFF and values:
+                file_size = values.pop(0)
+            if compress_size == 0xFFFFFFFF and values:
+                compress_size = values.pop(0)
+            break
+        position += 4 + length
+    return file_size, compress_size
+
+
+def recover_entries(file_handle, end: int) -> List[zipfile.ZipInfo]:
+    """
+    Rebuild the entries of an unfinished archive, written by ZipSink,
+    from its local file headers up to end
+    """
+    entries = []
+    file_handle.seek(0)
+    while file_handle.tell() < end:
+        header_offset = file_handle.tell()
+        (
+            signature,
+            extract_version,
+            _,
+            flag_bits,
+            compress_type,
+            dos_time,
+            date,
+            crc,
+            compress_size,
+            file_size,
+            name_length,
+            extra_length,
+        ) = LOCAL_HEADER.unpack(file_handle.read(LOCAL_HEADER.size))
+        if signature != LOCAL_HEADER_SIGNATURE:
+            raise zipfile.BadZipFile(f"No local header at {header_offset}")
+        name = file_handle.read(name_length)
+        extra = file_handle.read(extra_length)
+        info = zipfile.ZipInfo(
+            name.decode("utf-8" if flag_bits & 0x800 else "cp437"),
+            date_time=_dos_date_time(date, dos_time),
+        )
+        info.flag_bits = flag_bits
+        info.compress_type = compress_type
+        info.CRC = crc
+        info.file_size, info.compress_size = _zip64_sizes(
+            extra, file_size, compress_size
+        )
+        info.extract_version = extract_version
+        info.create_system = 3
+        info.external_attr = 0o644 << 16
+        info.extra = extra
+        info.header_offset = header_offset
+        entries.append(info)
+        file_handle.seek(info.compress_size, os.SEEK_CUR)
+    return entries
+
+
+class ZipSink(Sink):
+    """
+    Writes passes into a zip archive, stored without compression
+    as .pkpass files are zip archives already
+    """
+
+    def __init__(
+        self, path: str, date_time: Optional[Tuple[int, ...]] = None
+    ) -> None:
+        """
+        :param path: Path of the zip archive
+        :param date_time: Timestamp of the entries, Default now
+        """
+        self.path = path
+        self.date_time = date_time
+        self._file = None
+        self._zip = None
+        self._end = 0
+
+    def open(self, state: Optional[dict] = None) -> None:
+        if self.date_time is None:
+            self.date_time = time.localtime()[:6]
+        if not state:
+            self._file = open(self.path, "wb")
+            self._zip = zipfile.ZipFile(self._file, "w")
+            self._end = 0
+            return
+        # The central directory is only written on close, drop whatever
+        # was written after the checkpoint and rebuild the entries
+        self._file = open(self.path, "r+b")
+        self._file.truncate(state["offset"])
+        entries = recover_entries(self._file, state["offset"])
+        self._file.seek(state["offset"])
+        self._zip = zipfile.ZipFile(self._file, "w")
+        for info in entries:
+            self._zip.filelist.append(info)
+            self._zip.NameToInfo[info.filename] = info
+        self._end = state["offset"]
+
+    def _entry(self, name: str, size: int) -> zipfile.ZipInfo:
+        info = zipfile.ZipInfo(name, date_time=self.date_time)
+        info.create_system = 3
+        info.external_attr = 0o644 << 16
+        info.file_size = size
+        return info
+
+    def write(self, name: str, data: bytes) -> dict:
+        info = self._entry(name, len(data))
+        self._zip.writestr(info, data)
+        self._end = self._file.tell()
+        return {"offset": info.header_offset}
+
+    def write_file(self, name: str, path: str) -> dict:
+        info = self._entry(name, os.path.getsize(path))
+        with open(path, "rb") as source, self._zip.open(info, "w") as target:
+            shutil.copyfileobj(source, target)
+        self._end = self._file.tell()
+        return {"offset": info.header_offset}
+
+    def state(self) -> dict:
+        # End of the last complete entry, a failed write may have
+        # left a partial one behind
+        self._file.flush()
+        return {"offset": self._end}
+
+    def close(self) -> None:
+        try:
+            self._zip.close()
+        finally:
+            self._file.close()
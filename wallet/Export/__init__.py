@@ -0,0 +1,5 @@
+from .Sink import Sink
+from .TarSink import TarSink
+from .ZipSink import ZipSink
+from .ObjectStoreSink import LocalObjectStore, ObjectStore, ObjectStoreSink
+from .BatchExporter import BatchExporter, ExportResult
@@ -0,0 +1,112 @@
+"""
+Manifest creation for .pkpass archives
+"""
+import hashlib
+import os
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Union
+
+# Size of the chunks read from path backed files
+CHUNK_SIZE = 1024 * 1024
+
+# Total size of the files to hash before the thread pool is used,
+# smaller manifests are hashed inline as handing over costs more
+PARALLEL_THRESHOLD = 4 * 1024 * 1024
+
+FileData = Union[bytes, Path]
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> Executor:
+    """
+    Return the thread pool shared by all manifests, created on first use
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=min(32, (os.cpu_count() or 1) + 4),
+                    thread_name_prefix="wallet-manifest",
+                )
+    return _executor
+
+
+def file_digest(filedata: FileData) -> str:
+    """
+    Return the SHA-1 hex digest of bytes or of a file path,
+    files are read in chunks
+    :param filedata: bytes or pathlib.Path
+    """
+    if isinstance(filedata, Path):
+        sha1 = hashlib.sha1()
+        with filedata.open("rb") as file_handle:
+            for chunk in iter(lambda: file_handle.read(CHUNK_SIZE), b""):
+                sha1.update(chunk)
+        return sha1.hexdigest()
+    return hashlib.sha1(filedata).hexdigest()
+
+
+def file_size(filedata: FileData) -> int:
+    """Size of bytes or of a file path"""
+    if isinstance(filedata, Path):
+        return filedata.stat().st_size
+    return len(filedata)
+
+
+class Manifest:
+    """
+    Builds the manifest.json hashes of a pass
+    """
+
+    def __init__(
+        self,
+        executor: Optional[Executor] = None,
+        parallel_threshold: int = PARALLEL_THRESHOLD,
+    ) -> None:
+        """
+        :param executor: Executor to hash on, defaults to the shared pool
+        :param parallel_threshold: Total size in bytes from which the
+            files are hashed concurrently
+        """
+        self.executor = executor
+        self.parallel_threshold = parallel_threshold
+
+    def hashes(
+        self,
+        pass_json: bytes,
+        files: Mapping[str, FileData],
+        digests: Optional[Mapping[str, str]] = None,
+    ) -> Dict[str, str]:
+        """
+        Return the SHA-1 of pass.json and all files, keeps the order
+        of the files
+        :param pass_json: pass.json content
+        :param files: name to bytes or pathlib.Path
+        :param digests: precomputed hex digests by name, not rehashed
+        """
+        digests = digests or {}
+        pending = [name for name in files if name not in digests]
+        computed = {}
+        if pending:
+            total = sum(file_size(files[name]) for name in pending)
+            if len(pending) > 1 and total >= self.parallel_threshold:
+                executor = self.executor or get_executor()
+                futures = {
+                    name: executor.submit(file_digest, files[name])
+                    for name in pending
+                }
+                computed = {
+                    name: future.result() for name, future in futures.items()
+                }
+            else:
+                computed = {name: file_digest(files[name]) for name in pending}
+
+        hashes = {"pass.json": hashlib.sha1(pass_json).hexdigest()}
+        for name in files:
+            hashes[name] = digests[name] if name in digests else computed[name]
+        return hashes
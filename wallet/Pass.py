@@ -1,24 +1,30 @@
-import decimal
-import hashlib
 from io import BytesIO, BufferedReader
 import json
-import subprocess
-import zipfile
-import tempfile
-from uuid import uuid4
+import os
+import sys
 
 from wallet.PassInformation import PassInformation
 from typing import Optional, List, Union
 from wallet.PassProps import Barcode, Location, IBeacon, NFC
+from wallet.Schemas.PassSchema import get_schema
 from .exceptions import PassParameterException
 
+# Modules only needed to write archives (pathlib, shutil, tempfile,
+# zipfile, uuid, wallet.Manifest and wallet.Signing) are imported where
+# they are used, callers that only build pass.json do not pay for them.
+
+# Earliest timestamp a ZIP entry can hold, used for reproducible archives
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
 
 def pass_handler(obj):
     """Pass Handler"""
     if hasattr(obj, "json_dict"):
         return obj.json_dict()
-    # For Decimal latitude and logitude etc.
-    if isinstance(obj, decimal.Decimal):
+    # For Decimal latitude and logitude etc., a Decimal can only exist
+    # once the decimal module has been imported by the caller
+    decimal = sys.modules.get("decimal")
+    if decimal is not None and isinstance(obj, decimal.Decimal):
         return str(obj)
     return obj
 
@@ -31,7 +37,7 @@ class Pass:
         team_identifier: str,
         organization_name: str,
         *,
-        serial_number: str = str(uuid4()),
+        serial_number: Optional[str] = None,
         description: str = "pass description",
         background_color: Optional[str] = None,
         foreground_color: Optional[str] = None,
@@ -72,7 +78,10 @@ class Pass:
             signed the pass, as issued by Apple.
 
         :params serial_number: Serial number that
-            uniquely identifies the pass.
+            uniquely identifies the pass. A random uuid4 is generated
+            per pass if not given, use
+            wallet.utils.helpers.generate_serial_number for
+            reproducible serials.
 
         :params description: Brief description of
             the pass, used by the iOS
@@ -115,11 +124,16 @@ class Pass:
 
         self._files = {}  # Holds the files to include in the .pkpass
         self._hashes = {}  # Holds the SHAs of the files array
+        self._digests = {}  # Holds precomputed SHAs of added files
 
         # Standard Keys that required by Apple
         self.teamIdentifier = team_identifier
         self.passTypeIdentifier = pass_type_identifier
         self.organizationName = organization_name
+        if not serial_number:
+            from uuid import uuid4
+
+            serial_number = str(uuid4())
         self.serialNumber = serial_number
         self.description = description
         self.formatVersion = 1
@@ -155,57 +169,146 @@ class Pass:
         self.passInformation = pass_information
 
     def add_file(
-        self, name: str, file_handle: Union[BufferedReader, bytes]
+        self,
+        name: str,
+        file_handle: Union[BufferedReader, bytes],
+        digest: Optional[str] = None,
     ) -> None:
         """
         Add new file to the pass files
         :params name: String name
         :params file_handle: File Handle
+        :params digest: Optional precomputed SHA-1 hex digest of the file
         """
-        if type(file_handle) == bytes:
+        if isinstance(file_handle, bytes):
             self._files[name] = file_handle
-        elif type(file_handle) == BufferedReader:
+        elif isinstance(file_handle, BufferedReader):
             self._files[name] = file_handle.read()
+        else:
+            return
+        self._set_digest(name, digest)
+
+    def add_file_path(
+        self,
+        name: str,
+        path: Union[str, os.PathLike],
+        digest: Optional[str] = None,
+    ) -> None:
+        """
+        Add new file to the pass files, the file is only read in chunks
+        while hashing and writing the archive
+        :params name: String name
+        :params path: Path of the file
+        :params digest: Optional precomputed SHA-1 hex digest of the file
+        """
+        from pathlib import Path
+
+        path = Path(path)
+        if not path.is_file():
+            raise FileNotFoundError(path)
+        self._files[name] = path
+        self._set_digest(name, digest)
+
+    def _set_digest(self, name: str, digest: Optional[str]) -> None:
+        if digest:
+            self._digests[name] = digest
+        else:
+            self._digests.pop(name, None)
 
     def create(
         self,
-        certificate: str,
-        key: str,
-        wwdr_certificate: str,
+        certificate: Optional[str] = None,
+        key: Optional[str] = None,
+        wwdr_certificate: Optional[str] = None,
         password: Optional[str] = False,
         file_name: Optional[str] = None,
         filemode: bool = True,
+        validate: bool = True,
+        deterministic: bool = False,
+        signer=None,
+        signing_time=None,
     ):
         """
         Create .pkass file
+
+        :params certificate, key, wwdr_certificate: Paths for signing
+            with the openssl command, or contents if filemode is False.
+            Contents are signed in memory when cryptography is installed
+            and otherwise written to temporary files on every call,
+            prefer a signer for repeated signing.
+
+        :params signer: wallet.Signing.Signer to sign with instead of
+            certificate, key and wwdr_certificate, or a
+            wallet.Signing.SignerRegistry to pick the signer of the
+            passTypeIdentifier from. Without signer and certificates the
+            default registry is used.
+
+        :params validate: Validate pass.json against the schema of the
+            pass style, can be disabled for trusted bulk generation
+
+        :params deterministic: Identical pass content gives identical
+            archive bytes. Sorts the json keys and archive entries and
+            uses a fixed ZIP timestamp, requires signing_time.
+
+        :params signing_time: datetime stored as signing time in the
+            signed attributes of the signature, Default now
         """
-        pass_json = self._create_pass_json()
-        manifest = self._create_manifest(pass_json)
+        if deterministic and signing_time is None:
+            raise PassParameterException(
+                "deterministic requires a signing_time"
+            )
+        pass_json = self._create_pass_json(
+            validate=validate, deterministic=deterministic
+        )
+        manifest = self._create_manifest(
+            pass_json, deterministic=deterministic
+        )
         signature = self._create_signature(
-            manifest, certificate, key, wwdr_certificate, password, filemode
+            manifest,
+            certificate,
+            key,
+            wwdr_certificate,
+            password,
+            filemode,
+            signer=signer,
+            signing_time=signing_time,
         )
         if not file_name:
             file_name = BytesIO()
         pkpass_file = self._create_zip(
-            pass_json, manifest, signature, file_name=file_name
+            pass_json,
+            manifest,
+            signature,
+            file_name=file_name,
+            deterministic=deterministic,
         )
         return pkpass_file
 
-    def _create_pass_json(self):
+    def _create_pass_json(
+        self, validate: bool = True, deterministic: bool = False
+    ):
         """
         Create Json Pass Files
         """
-        return json.dumps(self, default=pass_handler).encode("utf-8")
+        return json.dumps(
+            self.json_dict(validate=validate),
+            default=pass_handler,
+            sort_keys=deterministic,
+        ).encode("utf-8")
 
-    def _create_manifest(self, pass_json: bytes):
+    def _create_manifest(self, pass_json: bytes, deterministic: bool = False):
         """
         Creates the hashes for the files and adds them
         into a json string
         """
-        self._hashes["pass.json"] = hashlib.sha1(pass_json).hexdigest()
-        for filename, filedata in self._files.items():
-            self._hashes[filename] = hashlib.sha1(filedata).hexdigest()
-        return json.dumps(self._hashes).encode("utf-8")
+        from wallet.Manifest import Manifest
+
+        self._hashes = Manifest().hashes(
+            pass_json, self._files, self._digests
+        )
+        return json.dumps(self._hashes, sort_keys=deterministic).encode(
+            "utf-8"
+        )
 
     def _create_signature(
         self,
@@ -215,8 +318,44 @@ class Pass:
         wwdr_certificate: str,
         password: str,
         filemode: bool,
+        signer=None,
+        signing_time=None,
     ) -> bytes:
         """Create and Save Signature"""
+        if signer is None and not (certificate and key and wwdr_certificate):
+            from wallet.Signing.SignerRegistry import get_default_registry
+
+            signer = get_default_registry()
+            if self.passTypeIdentifier not in signer:
+                raise PassParameterException(
+                    "certificate, key and wwdr_certificate or a signer"
+                    f" required, no signer registered for"
+                    f" {self.passTypeIdentifier}"
+                )
+        if hasattr(signer, "lease"):
+            # The registry keeps the signer open while it is in use
+            with signer.lease(
+                self.passTypeIdentifier, self.teamIdentifier
+            ) as leased:
+                return leased.sign(manifest, signing_time=signing_time)
+        if signer is not None:
+            return signer.sign(manifest, signing_time=signing_time)
+
+        import tempfile
+        from importlib.util import find_spec
+        from wallet.Signing.OpenSSLSigner import OpenSSLSigner
+
+        if not filemode and find_spec("cryptography") is not None:
+            from wallet.Signing.InMemorySigner import InMemorySigner
+
+            certificate, key, wwdr_certificate = (
+                value.encode("utf-8") if isinstance(value, str) else value
+                for value in (certificate, key, wwdr_certificate)
+            )
+            return InMemorySigner(
+                certificate, key, wwdr_certificate, password or None
+            ).sign(manifest, signing_time=signing_time)
+
         if not filemode:
             # Use Tempfile
             cert_file = tempfile.NamedTemporaryFile(mode="w")
@@ -232,35 +371,9 @@ class Pass:
             key = key_file.name
             wwdr_certificate = wwdr_file.name
 
-        openssl_cmd = [
-            "openssl",
-            "smime",
-            "-binary",
-            "-sign",
-            "-certfile",
-            wwdr_certificate,
-            "-signer",
-            certificate,
-            "-inkey",
-            key,
-            "-outform",
-            "DER",
-            "-passin",
-            f"pass:{password}",
-        ]
-
-        process = subprocess.Popen(
-            openssl_cmd,
-            stderr=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stdin=subprocess.PIPE,
-        )
-        process.stdin.write(manifest)
-        out_data, error = process.communicate()
-        if process.returncode != 0:
-            raise Exception(error)
-
-        return out_data
+        return OpenSSLSigner(
+            certificate, key, wwdr_certificate, password
+        ).sign(manifest, signing_time=signing_time)
 
     def _create_zip(
         self,
@@ -268,22 +381,52 @@ class Pass:
         manifest: bytes,
         signature: bytes,
         file_name: Union[BytesIO, str],
+        deterministic: bool = False,
     ) -> Union[BytesIO, str]:
         """
         Creats .pkass ZIP Archive
         """
+        from pathlib import Path
+        import shutil
+        import zipfile
+
+        files = self._files.items()
+        if deterministic:
+            files = sorted(files)
+
+        def entry(name):
+            if not deterministic:
+                return name
+            info = zipfile.ZipInfo(name, date_time=ZIP_EPOCH)
+            info.create_system = 3
+            info.external_attr = 0o644 << 16
+            return info
+
         z_file = zipfile.ZipFile(file_name or "pass.pkpass", "w")
-        z_file.writestr("signature", signature)
-        z_file.writestr("manifest.json", manifest)
-        z_file.writestr("pass.json", pass_json)
-        for filename, filedata in self._files.items():
-            z_file.writestr(filename, filedata)
+        z_file.writestr(entry("signature"), signature)
+        z_file.writestr(entry("manifest.json"), manifest)
+        z_file.writestr(entry("pass.json"), pass_json)
+        for filename, filedata in files:
+            if not isinstance(filedata, Path):
+                z_file.writestr(entry(filename), filedata)
+            elif not deterministic:
+                z_file.write(filedata, arcname=filename)
+            else:
+                info = entry(filename)
+                info.file_size = filedata.stat().st_size
+                with filedata.open("rb") as source, z_file.open(
+                    info, "w"
+                ) as target:
+                    shutil.copyfileobj(source, target)
         z_file.close()
         return file_name
 
-    def json_dict(self) -> dict:
+    def json_dict(self, validate: bool = True) -> dict:
         """
         Return Pass as JSON Dict
+
+        :params validate: Raise PassValidationException with all schema
+            violations of the pass style
         """
         simple_fields = [
             "description",
@@ -292,7 +435,8 @@ class Pass:
             "passTypeIdentifier",
             "serialNumber",
             "teamIdentifier",
-            "suppressStripShine" "relevantDate",
+            "suppressStripShine",
+            "relevantDate",
             "backgroundColor",
             "foregroundColor",
             "labelColor",
@@ -323,23 +467,12 @@ class Pass:
             data["locations"] = []
             for location in self.locations:
                 data["locations"].append(location.json_dict())
-            if len(data["locations"]) > 10:
-                raise PassParameterException("Field locations has<10 entries")
 
         if self.ibeacons:
             data["ibeacons"] = []
             for ibeacon in self.ibeacons:
                 data["ibeacons"].append(ibeacon.json_dict())
 
-        requied_fields = [
-            "description",
-            "formatVersion",
-            "organizationName",
-            "organizationName",
-            "serialNumber",
-            "teamIdentifier",
-        ]
-        for field in requied_fields:
-            if field not in data:
-                raise PassParameterException(f"Field {field} missing")
+        if validate:
+            get_schema(self.passInformation.jsonname).validate(data)
         return data
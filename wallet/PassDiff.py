@@ -0,0 +1,247 @@
+"""
+Structural diff of passes, to decide about updates and change messages
+"""
+import json
+from typing import Any, Dict, List, NamedTuple, Optional, Union
+
+from wallet.Schemas.PassSchema import FIELD_AREAS, FIELD_LIMITS
+
+STYLES = tuple(FIELD_LIMITS)
+
+BARCODE_KEYS = ("barcodes", "barcode")
+RELEVANCE_KEYS = ("locations", "ibeacons", "relevantDate", "maxDistance")
+
+
+class FieldChange(NamedTuple):
+    """Change of a field, old or new is None if added or removed"""
+
+    key: str
+    area: str
+    old: Optional[dict]
+    new: Optional[dict]
+
+    @property
+    def change_message(self) -> Optional[str]:
+        """changeMessage of the new field with %@ replaced by its value"""
+        if not self.new or "changeMessage" not in self.new:
+            return None
+        if self.old is not None and self.old.get("value") == self.new.get(
+            "value"
+        ):
+            return None
+        return self.new["changeMessage"].replace(
+            "%@", str(self.new.get("value"))
+        )
+
+
+class ValueChange(NamedTuple):
+    """Change of a top level key or an asset"""
+
+    key: str
+    old: Any
+    new: Any
+
+
+class PassState:
+    """
+    pass.json content and asset digests of a pass
+    """
+
+    __slots__ = ("data", "digests")
+
+    def __init__(self, data: dict, digests: Optional[Dict[str, str]] = None):
+        """
+        :param data: pass.json as dict
+        :param digests: SHA-1 hex digest by asset name
+        """
+        self.data = data
+        self.digests = digests or {}
+
+    @classmethod
+    def from_pass(cls, pass_file) -> "PassState":
+        """
+        State of a wallet.Pass, assets with precomputed digests
+        are not rehashed
+        """
+        from wallet.Manifest import Manifest
+
+        pass_json = pass_file._create_pass_json(validate=False)
+        digests = Manifest().hashes(
+            pass_json, pass_file._files, pass_file._digests
+        )
+        del digests["pass.json"]
+        return cls(json.loads(pass_json), digests)
+
+    @classmethod
+    def from_archive(cls, archive) -> "PassState":
+        """
+        State of a .pkpass archive, the asset digests are taken from
+        manifest.json so assets are not read
+        :param archive: Path, file object or bytes of the archive
+        """
+        import zipfile
+        from io import BytesIO
+
+        if isinstance(archive, bytes):
+            archive = BytesIO(archive)
+        with zipfile.ZipFile(archive) as z_file:
+            data = json.loads(z_file.read("pass.json"))
+            digests = json.loads(z_file.read("manifest.json"))
+        digests.pop("pass.json", None)
+        return cls(data, digests)
+
+
+class PassChangeSet:
+    """
+    Changes between two pass states
+    """
+
+    __slots__ = ("fields", "barcodes", "relevance", "assets", "keys")
+
+    def __init__(self):
+        self.fields: List[FieldChange] = []
+        self.barcodes: List[ValueChange] = []
+        self.relevance: List[ValueChange] = []
+        self.assets: List[ValueChange] = []
+        self.keys: List[ValueChange] = []
+
+    def __bool__(self) -> bool:
+        return bool(
+            self.fields or self.barcodes or self.relevance or self.assets
+            or self.keys
+        )
+
+    @property
+    def requires_update(self) -> bool:
+        """The pass differs, devices should be notified"""
+        return bool(self)
+
+    @property
+    def change_messages(self) -> List[str]:
+        """Messages shown on the device for the changed fields"""
+        return [
+            message
+            for message in (change.change_message for change in self.fields)
+            if message
+        ]
+
+    def as_dict(self) -> dict:
+        """Compact representation, only lists changed parts"""
+        data = {}
+        if self.fields:
+            data["fields"] = {
+                change.key: {
+                    "area": change.area,
+                    "old": change.old,
+                    "new": change.new,
+                }
+                for change in self.fields
+            }
+        for name in ("barcodes", "relevance", "assets", "keys"):
+            changes = getattr(self, name)
+            if changes:
+                data[name] = {
+                    change.key: {"old": change.old, "new": change.new}
+                    for change in changes
+                }
+        return data
+
+
+PassLike = Union[PassState, bytes, str, Any]
+
+
+def _keys(old: dict, new: dict) -> List[str]:
+    """Keys of both dicts, in order"""
+    return list(old) + [key for key in new if key not in old]
+
+
+def _state(value: PassLike) -> PassState:
+    if isinstance(value, PassState):
+        return value
+    if hasattr(value, "passInformation"):
+        return PassState.from_pass(value)
+    return PassState.from_archive(value)
+
+
+def _style(data: dict) -> Optional[str]:
+    for style in STYLES:
+        if style in data:
+            return style
+    return None
+
+
+def _fields(style_data: dict) -> Dict[str, tuple]:
+    fields = {}
+    for area in FIELD_AREAS:
+        for field in style_data.get(area) or ():
+            fields[field.get("key")] = (area, field)
+    return fields
+
+
+def _diff_fields(
+    style: str, old: dict, new: dict, changes: PassChangeSet
+) -> None:
+    if old == new:
+        return
+    # Only areas that differ need to be looked at field by field
+    areas = [
+        area for area in FIELD_AREAS if old.get(area) != new.get(area)
+    ]
+    old_fields = _fields({area: old.get(area) for area in areas})
+    new_fields = _fields({area: new.get(area) for area in areas})
+    for key, (area, field) in new_fields.items():
+        previous = old_fields.pop(key, None)
+        if previous is None:
+            changes.fields.append(FieldChange(key, area, None, field))
+        elif previous[1] != field or previous[0] != area:
+            changes.fields.append(FieldChange(key, area, previous[1], field))
+    for key, (area, field) in old_fields.items():
+        changes.fields.append(FieldChange(key, area, field, None))
+    for key in _keys(old, new):
+        if key not in FIELD_AREAS and old.get(key) != new.get(key):
+            changes.keys.append(
+                ValueChange(f"{style}.{key}", old.get(key), new.get(key))
+            )
+
+
+def diff_passes(old: PassLike, new: PassLike) -> PassChangeSet:
+    """
+    Return the changes between two passes
+
+    :param old: wallet.Pass, PassState or .pkpass archive
+        (path, file object or bytes)
+    :param new: wallet.Pass, PassState or .pkpass archive
+    """
+    old = _state(old)
+    new = _state(new)
+    changes = PassChangeSet()
+    if old.digests != new.digests:
+        for name in _keys(old.digests, new.digests):
+            before = old.digests.get(name)
+            after = new.digests.get(name)
+            if before != after:
+                changes.assets.append(ValueChange(name, before, after))
+    if old.data == new.data:
+        return changes
+
+    old_style = _style(old.data)
+    new_style = _style(new.data)
+    if old_style == new_style and old_style is not None:
+        _diff_fields(
+            new_style, old.data[old_style], new.data[new_style], changes
+        )
+    for key in _keys(old.data, new.data):
+        if key == old_style and key == new_style:
+            continue
+        before = old.data.get(key)
+        after = new.data.get(key)
+        if before == after:
+            continue
+        change = ValueChange(key, before, after)
+        if key in BARCODE_KEYS:
+            changes.barcodes.append(change)
+        elif key in RELEVANCE_KEYS:
+            changes.relevance.append(change)
+        else:
+            changes.keys.append(change)
+    return changes
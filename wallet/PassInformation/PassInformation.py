@@ -1,5 +1,9 @@
+from typing import TYPE_CHECKING, Optional
+
 from wallet.PassProps import Field
-from wallet.Schemas import FieldProps
+
+if TYPE_CHECKING:
+    from wallet.Schemas.FieldProps import FieldProps
 
 
 class PassInformation:
@@ -14,50 +18,65 @@ class PassInformation:
         self.backFields = []
         self.auxiliaryFields = []
 
-    def add_header_field(self, field_props: FieldProps):
+    def add_header_field(
+        self, field_props: Optional["FieldProps"] = None, **kwargs
+    ):
         """
         Add Simple Field to Header
         :param key:
         :param value:
         :param label: optional
+        Either FieldProps or the keyword arguments of Field
         """
-        self.headerFields.append(Field(field_props))
+        self.headerFields.append(Field(field_props, **kwargs))
 
-    def add_primary_field(self, field_props: FieldProps):
+    def add_primary_field(
+        self, field_props: Optional["FieldProps"] = None, **kwargs
+    ):
         """
         Add Simple Primary Field
         :param key:
         :param value:
         :param label: optional
+        Either FieldProps or the keyword arguments of Field
         """
-        self.primaryFields.append(Field(field_props))
+        self.primaryFields.append(Field(field_props, **kwargs))
 
-    def add_secondary_field(self, field_props: FieldProps):
+    def add_secondary_field(
+        self, field_props: Optional["FieldProps"] = None, **kwargs
+    ):
         """
         Add Simple Secondary Field
         :param key:
         :param value:
         :param label: optional
+        Either FieldProps or the keyword arguments of Field
         """
-        self.secondaryFields.append(Field(field_props))
+        self.secondaryFields.append(Field(field_props, **kwargs))
 
-    def add_back_field(self, field_props: FieldProps):
+    def add_back_field(
+        self, field_props: Optional["FieldProps"] = None, **kwargs
+    ):
         """
         Add Simple Back Field
         :param key:
         :param value:
         :param label: optional
+        Either FieldProps or the keyword arguments of Field
         """
-        self.backFields.append(Field(field_props))
+        self.backFields.append(Field(field_props, **kwargs))
 
-    def add_auxiliary_field(self, field_props: FieldProps):
+    def add_auxiliary_field(
+        self, field_props: Optional["FieldProps"] = None, **kwargs
+    ):
         """
         Add Simple Auxilary Field
         :param key:
         :param value:
         :param label: optional
+        Either FieldProps or the keyword arguments of Field
         """
-        self.auxiliaryFields.append(Field(field_props))
+        self.auxiliaryFields.append(Field(field_props, **kwargs))
 
     def json_dict(self):
         """
@@ -1,9 +1,13 @@
+DEFAULT_ENCODING = "iso-8859-1"
+
+
 class BarcodeFormat:
     """Barcode Format"""
 
     PDF417 = "PKBarcodeFormatPDF417"
     QR = "PKBarcodeFormatQR"
     AZTEC = "PKBarcodeFormatAztec"
+    CODE128 = "PKBarcodeFormatCode128"
 
 
 class Barcode:
@@ -11,22 +15,31 @@ class Barcode:
     Barcode Field
     """
 
-    def __init__(self, message: str, qr_format=BarcodeFormat.QR, alt_text=''):
+    def __init__(
+        self,
+        message: str,
+        qr_format=BarcodeFormat.QR,
+        alt_text='',
+        message_encoding=DEFAULT_ENCODING,
+    ):
         """
         Initiate Field
 
         :param message: Message or Payload for Barcdoe
-        :param format: pdf417/ qr/ aztec
-        :param encoding: Default utf-8
+        :param format: pdf417/ qr/ aztec/ code128
         :param alt_text: Optional Text displayed near the barcode
+        :param message_encoding: IANA character set name of the message,
+            Default iso-8859-1
         """
         self.format = qr_format
         self.message = message  # Required. Message or payload to be displayed
-        self.messageEncoding = (
-            "iso-8859-1"  # Required. Text encoding
-        )
+        self.messageEncoding = message_encoding  # Required. Text encoding
         self.altText = alt_text  # Optional. Text displayed near the barcode
 
+    def encoded_message(self) -> bytes:
+        """Return the message bytes as encoded in the barcode"""
+        return self.message.encode(self.messageEncoding)
+
     def json_dict(self):
         """Return dict object from class"""
         return self.__dict__
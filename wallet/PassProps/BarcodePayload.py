@@ -0,0 +1,130 @@
+import base64
+import hmac
+from abc import ABC, abstractmethod
+from operator import attrgetter
+from typing import Callable, Iterable, List, Optional, Union
+
+from .Barcode import Barcode, BarcodeFormat, DEFAULT_ENCODING
+
+
+class BarcodePayloadGenerator(ABC):
+    """
+    Base class for barcode message generators
+
+    Subclasses implement generate, generate_many and apply work on
+    whole batches.
+    """
+
+    @abstractmethod
+    def generate(self, message: str) -> str:
+        """
+        Return the barcode payload for a message
+        :param message: e.g. ticket number or serial number
+        """
+
+    def generate_many(self, messages: Iterable[str]) -> List[str]:
+        """
+        Return the barcode payloads for many messages
+        :param messages: Iterable of messages
+        """
+        generate = self.generate
+        return [generate(message) for message in messages]
+
+    def barcodes(
+        self,
+        messages: Iterable[str],
+        qr_format: str = BarcodeFormat.QR,
+        alt_text: Union[str, Callable[[str], str]] = "",
+        message_encoding: str = DEFAULT_ENCODING,
+    ) -> List[Barcode]:
+        """
+        Return a Barcode per message with the generated payload
+        :param messages: Iterable of messages
+        :param qr_format: pdf417/ qr/ aztec/ code128
+        :param alt_text: Text or function of the message for the alt text
+        :param message_encoding: IANA character set name of the payload
+        """
+        messages = list(messages)
+        payloads = self.generate_many(messages)
+        if callable(alt_text):
+            alt_texts = [alt_text(message) for message in messages]
+        else:
+            alt_texts = [alt_text] * len(messages)
+        return [
+            Barcode(payload, qr_format, text, message_encoding)
+            for payload, text in zip(payloads, alt_texts)
+        ]
+
+    def apply(
+        self,
+        passes: Iterable,
+        source: Callable = attrgetter("serialNumber"),
+        **kwargs
+    ) -> None:
+        """
+        Replace the barcodes of many passes by generated ones
+        :param passes: Iterable of wallet.Pass
+        :param source: Function returning the message of a pass,
+            Default the serial number
+        :param kwargs: Options of barcodes
+        """
+        passes = list(passes)
+        barcodes = self.barcodes([source(p) for p in passes], **kwargs)
+        for pass_file, barcode in zip(passes, barcodes):
+            pass_file.barcodes = [barcode]
+
+
+class PlainPayloadGenerator(BarcodePayloadGenerator):
+    """Uses the message unchanged as payload"""
+
+    def generate(self, message: str) -> str:
+        return message
+
+    def generate_many(self, messages: Iterable[str]) -> List[str]:
+        return list(messages)
+
+
+class HMACPayloadGenerator(BarcodePayloadGenerator):
+    """
+    Appends an HMAC of the message to the payload,
+    <message><separator><base64url mac>
+    """
+
+    def __init__(
+        self,
+        secret: bytes,
+        digestmod: str = "sha256",
+        separator: str = ".",
+        digest_size: Optional[int] = None,
+    ) -> None:
+        """
+        :param secret: HMAC key
+        :param digestmod: hashlib name of the digest
+        :param separator: Separator between message and mac
+        :param digest_size: Truncate the mac to this many bytes
+            to keep barcodes small
+        """
+        # Keyed once, every payload only copies the prepared state
+        self._hmac = hmac.new(secret, digestmod=digestmod)
+        self.separator = separator
+        self.digest_size = digest_size
+
+    def mac(self, message: str) -> str:
+        """Return the base64url encoded mac of a message"""
+        mac = self._hmac.copy()
+        mac.update(message.encode("utf-8"))
+        digest = mac.digest()[: self.digest_size]
+        return base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ascii")
+
+    def generate(self, message: str) -> str:
+        return f"{message}{self.separator}{self.mac(message)}"
+
+    def verify(self, payload: str) -> bool:
+        """
+        Check the mac of a payload
+        :param payload: Scanned barcode message
+        """
+        message, _, signature = payload.rpartition(self.separator)
+        if not _:
+            return False
+        return hmac.compare_digest(self.mac(message), signature)
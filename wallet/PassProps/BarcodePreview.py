@@ -0,0 +1,72 @@
+from functools import lru_cache
+from io import BytesIO
+from typing import Callable, Dict, Optional
+
+from .Barcode import Barcode, BarcodeFormat
+
+# Renders the encoded message of a barcode to PNG bytes at a scale
+Renderer = Callable[[bytes, int], bytes]
+
+
+def render_qr(data: bytes, scale: int) -> bytes:
+    """Render a QR code with segno (optional dependency)"""
+    try:
+        import segno
+    except ImportError as error:
+        raise ImportError(
+            "QR previews require segno, install it with: pip install segno"
+        ) from error
+    output = BytesIO()
+    segno.make_qr(data, encoding=None).save(output, kind="png", scale=scale)
+    return output.getvalue()
+
+
+DEFAULT_RENDERERS = {BarcodeFormat.QR: render_qr}
+
+
+class BarcodePreview:
+    """
+    PNG previews of barcodes, cached by format, message,
+    encoding and scale
+    """
+
+    def __init__(
+        self,
+        renderers: Optional[Dict[str, Renderer]] = None,
+        maxsize: int = 1024,
+    ) -> None:
+        """
+        :param renderers: Renderer per barcode format, added to the
+            default QR renderer. Register PDF417 and Aztec renderers
+            here, e.g. based on treepoem.
+        :param maxsize: Number of previews kept in the LRU cache
+        """
+        self.renderers = dict(DEFAULT_RENDERERS)
+        self.renderers.update(renderers or {})
+        self._render = lru_cache(maxsize=maxsize)(self._render_uncached)
+
+    def render(self, barcode: Barcode, scale: int = 4) -> bytes:
+        """
+        Return the PNG preview of a barcode
+        :param barcode: wallet.PassProps.Barcode
+        :param scale: Size of a module in pixels
+        """
+        return self._render(
+            barcode.format, barcode.message, barcode.messageEncoding, scale
+        )
+
+    def cache_info(self):
+        """Statistics of the preview cache"""
+        return self._render.cache_info()
+
+    def cache_clear(self) -> None:
+        """Empty the preview cache"""
+        self._render.cache_clear()
+
+    def _render_uncached(
+        self, qr_format: str, message: str, encoding: str, scale: int
+    ) -> bytes:
+        renderer = self.renderers.get(qr_format)
+        if renderer is None:
+            raise ValueError(f"No preview renderer for {qr_format}")
+        return renderer(message.encode(encoding), scale)
@@ -1,6 +1,21 @@
+from typing import TYPE_CHECKING, Optional
+
+from .Alignment import Alignment
 from .DateStyle import DateStyle
 from .NumberStyle import NumberStyle
-from wallet.Schemas import FieldProps
+from wallet.exceptions import PassParameterException
+
+if TYPE_CHECKING:
+    from wallet.Schemas.FieldProps import FieldProps
+
+FIELD_PROPS = (
+    "key",
+    "value",
+    "label",
+    "attributed_value",
+    "change_message",
+    "text_alignment",
+)
 
 
 class Field:
@@ -8,10 +23,12 @@ class Field:
 
     def __init__(
         self,
-        feild_props: FieldProps
+        feild_props: Optional["FieldProps"] = None,
+        **kwargs
     ) -> None:
         """
-         Initiate Field
+         Initiate Field from FieldProps or, without pydantic
+         validation, from keyword arguments
 
         :param key: The key must be unique within the scope
         :param value: Value of the Field
@@ -22,13 +39,17 @@ class Field:
         :return: Nothing
 
         """
-        self.key = feild_props.key
-        self.value = feild_props.value
-        self.label = feild_props.label
-        self.attributedValue = feild_props.attributed_value
-        if feild_props.change_message:
-            self.changeMessage = feild_props.change_message
-        self.textAlignment = feild_props.text_alignment
+        if feild_props is not None:
+            kwargs = {name: getattr(feild_props, name) for name in FIELD_PROPS}
+        if "key" not in kwargs or "value" not in kwargs:
+            raise PassParameterException("Field key and value are required")
+        self.key = kwargs["key"]
+        self.value = kwargs["value"]
+        self.label = kwargs.get("label")
+        self.attributedValue = kwargs.get("attributed_value")
+        if kwargs.get("change_message"):
+            self.changeMessage = kwargs["change_message"]
+        self.textAlignment = kwargs.get("text_alignment", Alignment.LEFT)
 
     def json_dict(self):
         """Return dict object from class"""
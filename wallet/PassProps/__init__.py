@@ -1,8 +1,27 @@
 from .Alignment import Alignment
-from .Barcode import Barcode
+from .Barcode import Barcode, BarcodeFormat
 from .DateStyle import DateStyle
 from .Field import Field
 from .IBeacon import IBeacon
 from .Location import Location
 from .NumberStyle import NumberStyle
 from .TransitType import TransitType
+
+# Barcode payload generators are only imported when they are used,
+# names matching a submodule can not be exported lazily as importing
+# the submodule binds the module to that name
+_LAZY = {
+    "BarcodePayloadGenerator": ".BarcodePayload",
+    "HMACPayloadGenerator": ".BarcodePayload",
+    "PlainPayloadGenerator": ".BarcodePayload",
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    value = getattr(import_module(_LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
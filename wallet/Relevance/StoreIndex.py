@@ -0,0 +1,315 @@
+import copy
+import heapq
+import math
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple, Union
+
+from wallet.PassProps import IBeacon, Location
+from wallet.Schemas.PassSchema import MAX_IBEACONS, MAX_LOCATIONS
+
+EARTH_RADIUS = 6371008.8  # meters
+
+# Entries of the holder x store matrix per chunk of the NumPy path
+NUMPY_CHUNK_SIZE = 4 * 1024 * 1024
+
+Point = Tuple[float, float]
+RelevantText = Union[str, Callable[[Location], str], None]
+
+
+def _check_location_count(count: int) -> None:
+    if count > MAX_LOCATIONS:
+        raise ValueError(f"A pass holds at most {MAX_LOCATIONS} locations")
+
+
+def to_vector(latitude: float, longitude: float) -> Tuple[float, float, float]:
+    """Unit vector of a position on the sphere"""
+    lat = math.radians(latitude)
+    lon = math.radians(longitude)
+    cos_lat = math.cos(lat)
+    return (cos_lat * math.cos(lon), cos_lat * math.sin(lon), math.sin(lat))
+
+
+def chord_to_meters(chord_squared: float) -> float:
+    """Great circle distance of a squared chord between unit vectors"""
+    chord = math.sqrt(chord_squared)
+    return 2 * EARTH_RADIUS * math.asin(min(1.0, chord / 2))
+
+
+def meters_to_chord(meters: float) -> float:
+    """Squared chord of a great circle distance"""
+    angle = min(math.pi, meters / EARTH_RADIUS)
+    return (2 * math.sin(angle / 2)) ** 2
+
+
+class StoreIndex:
+    """
+    Spatial index over a store catalogue to pick the locations and
+    iBeacons that are relevant for a pass holder
+
+    The stores are kept in a k-d tree over unit vectors, nearest
+    neighbours by straight line distance are also nearest by great
+    circle distance, so there are no issues at the poles or the date
+    line. Batched queries are vectorized with NumPy when installed.
+    """
+
+    def __init__(
+        self,
+        locations: Sequence[Location],
+        ibeacons: Optional[Sequence[Sequence[IBeacon]]] = None,
+    ) -> None:
+        """
+        Build the index
+
+        :param locations: Location of every store
+        :param ibeacons: Optional iBeacons of every store, same order
+            as locations
+        """
+        if ibeacons is not None and len(ibeacons) != len(locations):
+            raise ValueError("ibeacons must have one entry per location")
+        self.locations = list(locations)
+        self.ibeacons = [list(b) for b in ibeacons] if ibeacons else None
+        self._vectors = [
+            to_vector(location.latitude, location.longitude)
+            for location in self.locations
+        ]
+        self._tree = self._build(list(range(len(self._vectors))), 0)
+        self._array = None
+
+    def __len__(self) -> int:
+        return len(self.locations)
+
+    def _build(self, indices: List[int], depth: int):
+        """Node is (index, axis, left, right)"""
+        if not indices:
+            return None
+        axis = depth % 3
+        vectors = self._vectors
+        indices.sort(key=lambda i: vectors[i][axis])
+        median = len(indices) // 2
+        return (
+            indices[median],
+            axis,
+            self._build(indices[:median], depth + 1),
+            self._build(indices[median + 1:], depth + 1),
+        )
+
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        count: int = MAX_LOCATIONS,
+        max_distance: Optional[float] = None,
+    ) -> List[Tuple[int, float]]:
+        """
+        Return (store index, distance in meters) of the nearest stores,
+        nearest first
+        :param latitude: Latitude of the holder
+        :param longitude: Longitude of the holder
+        :param count: Number of stores
+        :param max_distance: Optional maximum distance in meters
+        """
+        if count <= 0:
+            return []
+        point = to_vector(latitude, longitude)
+        limit = math.inf if max_distance is None else meters_to_chord(max_distance)
+        vectors = self._vectors
+        heap = []  # max heap of (-distance, -index)
+
+        def search(node):
+            index, axis, left, right = node
+            vector = vectors[index]
+            distance = (
+                (vector[0] - point[0]) ** 2
+                + (vector[1] - point[1]) ** 2
+                + (vector[2] - point[2]) ** 2
+            )
+            if distance <= limit:
+                item = (-distance, -index)
+                if len(heap) < count:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+            delta = point[axis] - vector[axis]
+            near, far = (left, right) if delta < 0 else (right, left)
+            if near is not None:
+                search(near)
+            if far is not None:
+                worst = -heap[0][0] if len(heap) == count else limit
+                if delta * delta <= worst:
+                    search(far)
+
+        if self._tree is not None:
+            search(self._tree)
+        return [
+            (-index, chord_to_meters(-distance))
+            for distance, index in sorted(heap, reverse=True)
+        ]
+
+    def nearest_many(
+        self,
+        points: Iterable[Point],
+        count: int = MAX_LOCATIONS,
+        max_distance: Optional[float] = None,
+        use_numpy: Optional[bool] = None,
+    ) -> List[List[Tuple[int, float]]]:
+        """
+        Batched nearest, one result per (latitude, longitude) point
+        :param points: Iterable of (latitude, longitude)
+        :param count: Number of stores per point
+        :param max_distance: Optional maximum distance in meters
+        :param use_numpy: Force or disable the NumPy path,
+            Default use NumPy when installed
+        """
+        points = list(points)
+        if use_numpy is None:
+            try:
+                import numpy  # noqa: F401
+
+                use_numpy = True
+            except ImportError:
+                use_numpy = False
+        if not use_numpy or not self.locations or count <= 0:
+            return [
+                self.nearest(latitude, longitude, count, max_distance)
+                for latitude, longitude in points
+            ]
+        return self._nearest_many_numpy(points, count, max_distance)
+
+    def _nearest_many_numpy(
+        self, points: List[Point], count: int, max_distance: Optional[float]
+    ) -> List[List[Tuple[int, float]]]:
+        import numpy as np
+
+        if self._array is None:
+            self._array = np.array(self._vectors, dtype=np.float64)
+        stores = self._array
+        count = min(count, len(stores))
+        limit = np.inf if max_distance is None else meters_to_chord(max_distance)
+        chunk = max(1, NUMPY_CHUNK_SIZE // len(stores))
+        results = []
+        for start in range(0, len(points), chunk):
+            coordinates = np.radians(
+                np.array(points[start:start + chunk], dtype=np.float64)
+            )
+            latitudes, longitudes = coordinates[:, 0], coordinates[:, 1]
+            vectors = np.stack(
+                (
+                    np.cos(latitudes) * np.cos(longitudes),
+                    np.cos(latitudes) * np.sin(longitudes),
+                    np.sin(latitudes),
+                ),
+                axis=1,
+            )
+            # Nearest stores have the largest dot product
+            similarity = vectors @ stores.T
+            if count < len(stores):
+                nearest = np.argpartition(
+                    similarity, len(stores) - count, axis=1
+                )[:, len(stores) - count:]
+            else:
+                nearest = np.broadcast_to(
+                    np.arange(len(stores)), similarity.shape
+                )
+            rows = np.arange(len(vectors))[:, None]
+            # |a - b|^2 of unit vectors is 2 - 2 a.b
+            candidates = np.maximum(
+                2.0 - 2.0 * similarity[rows, nearest], 0.0
+            )
+            order = np.lexsort((nearest, candidates), axis=1)
+            nearest = nearest[rows, order]
+            candidates = candidates[rows, order]
+            meters = 2 * EARTH_RADIUS * np.arcsin(
+                np.minimum(1.0, np.sqrt(candidates) / 2)
+            )
+            for indices, chords, row in zip(
+                nearest.tolist(), candidates.tolist(), meters.tolist()
+            ):
+                results.append(
+                    [
+                        (index, distance)
+                        for index, chord, distance in zip(indices, chords, row)
+                        if chord <= limit
+                    ]
+                )
+        return results
+
+    def relevance(
+        self,
+        nearest: Sequence[Tuple[int, float]],
+        relevant_text: RelevantText = None,
+        max_ibeacons: int = MAX_IBEACONS,
+    ) -> Tuple[List[Location], List[IBeacon]]:
+        """
+        Return the locations and iBeacons of a nearest result
+        :param nearest: Result of nearest
+        :param relevant_text: Text or function of the store Location,
+            set on the locations and iBeacons of the store,
+            Default keep the relevantText of the catalogue
+        :param max_ibeacons: Maximum number of iBeacons
+        """
+        locations = []
+        ibeacons = []
+        for index, _ in nearest:
+            location = self.locations[index]
+            beacons = self.ibeacons[index] if self.ibeacons else []
+            if relevant_text is not None:
+                text = (
+                    relevant_text(location)
+                    if callable(relevant_text)
+                    else relevant_text
+                )
+                location = copy.copy(location)
+                location.relevantText = text
+                beacons = [copy.copy(beacon) for beacon in beacons]
+                for beacon in beacons:
+                    beacon.relevantText = text
+            locations.append(location)
+            ibeacons.extend(beacons)
+        return locations, ibeacons[:max_ibeacons]
+
+    def fill(
+        self,
+        pass_file,
+        latitude: float,
+        longitude: float,
+        count: int = MAX_LOCATIONS,
+        relevant_text: RelevantText = None,
+        max_distance: Optional[float] = None,
+    ) -> None:
+        """
+        Set locations and ibeacons of a pass to the nearest stores
+        :param pass_file: wallet.Pass
+        :param latitude: Latitude of the holder
+        :param longitude: Longitude of the holder
+        :param count: Number of locations, at most 10
+        :param relevant_text: Text or function of the store Location
+        :param max_distance: Optional maximum distance in meters
+        """
+        _check_location_count(count)
+        nearest = self.nearest(latitude, longitude, count, max_distance)
+        self._set(pass_file, nearest, relevant_text)
+
+    def fill_many(
+        self,
+        passes: Iterable,
+        points: Iterable[Point],
+        count: int = MAX_LOCATIONS,
+        relevant_text: RelevantText = None,
+        max_distance: Optional[float] = None,
+        use_numpy: Optional[bool] = None,
+    ) -> None:
+        """
+        Batched fill, passes and (latitude, longitude) points in the
+        same order
+        """
+        _check_location_count(count)
+        passes = list(passes)
+        results = self.nearest_many(points, count, max_distance, use_numpy)
+        if len(results) != len(passes):
+            raise ValueError("passes and points must have the same length")
+        for pass_file, nearest in zip(passes, results):
+            self._set(pass_file, nearest, relevant_text)
+
+    def _set(self, pass_file, nearest, relevant_text) -> None:
+        locations, ibeacons = self.relevance(nearest, relevant_text)
+        pass_file.locations = locations or None
+        pass_file.ibeacons = ibeacons or None
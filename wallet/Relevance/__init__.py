@@ -0,0 +1 @@
+from .StoreIndex import StoreIndex
@@ -0,0 +1,287 @@
+import re
+from functools import lru_cache
+from typing import Callable, Dict, List
+
+from wallet.exceptions import PassValidationException
+from wallet.PassProps.Barcode import BarcodeFormat
+from wallet.PassProps.TransitType import TransitType
+
+REQUIRED_KEYS = (
+    "description",
+    "formatVersion",
+    "organizationName",
+    "passTypeIdentifier",
+    "serialNumber",
+    "teamIdentifier",
+)
+
+FIELD_AREAS = (
+    "headerFields",
+    "primaryFields",
+    "secondaryFields",
+    "auxiliaryFields",
+    "backFields",
+)
+
+# Maximum number of fields per area for each pass style,
+# backFields are not limited.
+FIELD_LIMITS = {
+    "boardingPass": {
+        "headerFields": 3,
+        "primaryFields": 2,
+        "secondaryFields": 5,
+        "auxiliaryFields": 5,
+    },
+    "coupon": {
+        "headerFields": 3,
+        "primaryFields": 1,
+        "secondaryFields": 4,
+        "auxiliaryFields": 4,
+    },
+    "eventTicket": {
+        "headerFields": 3,
+        "primaryFields": 1,
+        "secondaryFields": 4,
+        "auxiliaryFields": 4,
+    },
+    "generic": {
+        "headerFields": 3,
+        "primaryFields": 1,
+        "secondaryFields": 4,
+        "auxiliaryFields": 4,
+    },
+    "storeCard": {
+        "headerFields": 3,
+        "primaryFields": 1,
+        "secondaryFields": 4,
+        "auxiliaryFields": 4,
+    },
+}
+
+# Styles where secondary and auxiliary fields share one limit
+# when the pass has a square barcode
+COMBINED_LIMITS = {
+    "coupon": 4,
+    "generic": 4,
+    "storeCard": 4,
+}
+
+MAX_LOCATIONS = 10
+MAX_IBEACONS = 10
+MIN_AUTHENTICATION_TOKEN_LENGTH = 16
+
+COLOR_KEYS = ("backgroundColor", "foregroundColor", "labelColor")
+
+COLOR_PATTERN = re.compile(
+    r"^rgb\(\s*(\d{1,3})\s*,\s*(\d{1,3})\s*,\s*(\d{1,3})\s*\)$"
+)
+
+BARCODE_FORMATS = frozenset(
+    (
+        BarcodeFormat.PDF417,
+        BarcodeFormat.QR,
+        BarcodeFormat.AZTEC,
+        BarcodeFormat.CODE128,
+    )
+)
+
+SQUARE_BARCODE_FORMATS = frozenset((BarcodeFormat.QR, BarcodeFormat.AZTEC))
+
+TRANSIT_TYPES = frozenset(
+    (
+        TransitType.AIR,
+        TransitType.TRAIN,
+        TransitType.BUS,
+        TransitType.BOAT,
+        TransitType.GENERIC,
+    )
+)
+
+
+class PassSchema:
+    """
+    pass.json validator for one pass style
+
+    The checks are compiled once into a mapping of top level key to
+    check function, validation then walks the pass dict a single time
+    and collects every violation instead of stopping at the first one.
+    """
+
+    def __init__(self, style: str) -> None:
+        """
+        Compile Schema
+
+        :param style: json name of the pass style, e.g. storeCard
+        """
+        if style not in FIELD_LIMITS:
+            raise ValueError(f"Unknown pass style {style}")
+        self.style = style
+        self.field_limits = FIELD_LIMITS[style]
+        self.combined_limit = COMBINED_LIMITS.get(style)
+        self._checks: Dict[str, Callable[[object, List[str]], None]] = {
+            style: self._check_style,
+            "formatVersion": self._check_format_version,
+            "barcodes": self._check_barcodes,
+            "locations": self._check_locations,
+            "ibeacons": self._check_ibeacons,
+            "authenticationToken": self._check_authentication_token,
+        }
+        for key in COLOR_KEYS:
+            self._checks[key] = self._color_check(key)
+
+    def errors(self, data: dict) -> List[str]:
+        """
+        Return all violations of the pass dict
+        :param data: pass.json as dict
+        """
+        errors = []
+        missing = set(REQUIRED_KEYS)
+        checks = self._checks
+        has_style = False
+        for key, value in data.items():
+            missing.discard(key)
+            check = checks.get(key)
+            if check is not None:
+                if key == self.style:
+                    has_style = True
+                check(value, errors)
+        if self.combined_limit is not None and has_style:
+            self._check_combined_limit(data, errors)
+        for key in REQUIRED_KEYS:
+            if key in missing:
+                errors.append(f"Field {key} missing")
+        if not has_style:
+            errors.append(f"Field {self.style} missing")
+        if "webServiceURL" in data and "authenticationToken" not in data:
+            errors.append("Field webServiceURL requires authenticationToken")
+        return errors
+
+    def validate(self, data: dict) -> dict:
+        """
+        Validate the pass dict, raises PassValidationException
+        with all violations
+        :param data: pass.json as dict
+        """
+        errors = self.errors(data)
+        if errors:
+            raise PassValidationException(errors)
+        return data
+
+    def _check_style(self, value: dict, errors: List[str]) -> None:
+        """Field counts, keys unique within the pass, transit type"""
+        seen_keys = set()
+        for area in FIELD_AREAS:
+            fields = value.get(area) or []
+            limit = self.field_limits.get(area)
+            if limit is not None and len(fields) > limit:
+                errors.append(
+                    f"Field {self.style}.{area} has more than {limit} entries"
+                )
+            for index, field in enumerate(fields):
+                key = field.get("key")
+                if not key:
+                    errors.append(
+                        f"Field {self.style}.{area}[{index}] key missing"
+                    )
+                elif key in seen_keys:
+                    errors.append(f"Field key {key} is not unique")
+                else:
+                    seen_keys.add(key)
+                if field.get("value") is None:
+                    errors.append(
+                        f"Field {self.style}.{area}[{index}] value missing"
+                    )
+        if self.style == "boardingPass":
+            if value.get("transitType") not in TRANSIT_TYPES:
+                errors.append(f"Field {self.style}.transitType is invalid")
+
+    def _check_combined_limit(self, data: dict, errors: List[str]) -> None:
+        """Secondary and auxiliary fields next to a square barcode"""
+        barcodes = data.get("barcodes") or []
+        if "barcode" in data:
+            barcodes = [*barcodes, data["barcode"]]
+        if not any(
+            barcode.get("format") in SQUARE_BARCODE_FORMATS
+            for barcode in barcodes
+        ):
+            return
+        value = data[self.style]
+        count = len(value.get("secondaryFields") or []) + len(
+            value.get("auxiliaryFields") or []
+        )
+        if count > self.combined_limit:
+            errors.append(
+                f"Field {self.style} has more than {self.combined_limit}"
+                " secondary and auxiliary fields combined"
+            )
+
+    @staticmethod
+    def _check_format_version(value: int, errors: List[str]) -> None:
+        if value != 1:
+            errors.append("Field formatVersion must be 1")
+
+    @staticmethod
+    def _check_barcodes(value: list, errors: List[str]) -> None:
+        for index, barcode in enumerate(value):
+            if barcode.get("format") not in BARCODE_FORMATS:
+                errors.append(f"Field barcodes[{index}].format is invalid")
+            if barcode.get("message") is None:
+                errors.append(f"Field barcodes[{index}].message missing")
+            if not barcode.get("messageEncoding"):
+                errors.append(
+                    f"Field barcodes[{index}].messageEncoding missing"
+                )
+
+    @staticmethod
+    def _check_locations(value: list, errors: List[str]) -> None:
+        if len(value) > MAX_LOCATIONS:
+            errors.append(
+                f"Field locations has more than {MAX_LOCATIONS} entries"
+            )
+        for index, location in enumerate(value):
+            latitude = location.get("latitude")
+            longitude = location.get("longitude")
+            if latitude is None or not -90 <= latitude <= 90:
+                errors.append(f"Field locations[{index}].latitude is invalid")
+            if longitude is None or not -180 <= longitude <= 180:
+                errors.append(
+                    f"Field locations[{index}].longitude is invalid"
+                )
+
+    @staticmethod
+    def _check_ibeacons(value: list, errors: List[str]) -> None:
+        if len(value) > MAX_IBEACONS:
+            errors.append(
+                f"Field ibeacons has more than {MAX_IBEACONS} entries"
+            )
+        for index, ibeacon in enumerate(value):
+            if not ibeacon.get("proximityUUID"):
+                errors.append(
+                    f"Field ibeacons[{index}].proximityUUID missing"
+                )
+
+    @staticmethod
+    def _check_authentication_token(value: str, errors: List[str]) -> None:
+        if len(value) < MIN_AUTHENTICATION_TOKEN_LENGTH:
+            errors.append(
+                "Field authenticationToken must be at least"
+                f" {MIN_AUTHENTICATION_TOKEN_LENGTH} characters"
+            )
+
+    @staticmethod
+    def _color_check(key: str) -> Callable[[str, List[str]], None]:
+        def check(value: str, errors: List[str]) -> None:
+            match = COLOR_PATTERN.match(value)
+            if not match or any(int(c) > 255 for c in match.groups()):
+                errors.append(f"Field {key} is not a valid rgb() color")
+
+        return check
+
+
+@lru_cache(maxsize=None)
+def get_schema(style: str) -> PassSchema:
+    """
+    Return the compiled schema for a pass style
+    :param style: json name of the pass style, e.g. storeCard
+    """
+    return PassSchema(style)
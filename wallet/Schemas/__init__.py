@@ -0,0 +1 @@
+from .PassSchema import PassSchema, get_schema
@@ -0,0 +1,140 @@
+from datetime import datetime
+from typing import Optional, Union
+
+from .Signer import Signer
+
+
+def _require_cryptography():
+    try:
+        import cryptography  # noqa: F401
+    except ImportError as error:
+        raise ImportError(
+            "In memory signing requires cryptography, install it with:"
+            " pip install cryptography"
+        ) from error
+
+
+class InMemorySigner(Signer):
+    """
+    Signs with a key held in memory, no files or processes are
+    involved per signature
+
+    Key objects of cryptography are immutable, so threads sign
+    concurrently without any pooling or locking.
+    """
+
+    def __init__(
+        self,
+        certificate: bytes,
+        key: Union[bytes, object],
+        wwdr_certificate: bytes,
+        password: Optional[Union[str, bytes]] = None,
+    ) -> None:
+        """
+        :param certificate: Pass type certificate, PEM or DER
+        :param key: Private key, PEM or DER or a loaded cryptography key
+        :param wwdr_certificate: Apple WWDR certificate, PEM or DER
+        :param password: Optional password of an encrypted key,
+            the key is decrypted once here
+        """
+        _require_cryptography()
+        from cryptography.hazmat.primitives import serialization
+
+        self.certificate = load_certificate(certificate)
+        self.wwdr_certificate = load_certificate(wwdr_certificate)
+        if isinstance(key, bytes):
+            if isinstance(password, str):
+                password = password.encode("utf-8")
+            loader = (
+                serialization.load_pem_private_key
+                if key.lstrip().startswith(b"-----")
+                else serialization.load_der_private_key
+            )
+            key = loader(key, password=password or None)
+        self.key = key
+
+    @property
+    def not_valid_after(self):
+        """Expiry of the pass type certificate as aware datetime"""
+        return certificate_expiry(self.certificate)
+
+    def sign(
+        self, manifest: bytes, signing_time: Optional[datetime] = None
+    ) -> bytes:
+        from cryptography.hazmat.primitives import hashes, serialization
+        from cryptography.hazmat.primitives.asymmetric import padding
+        from cryptography.hazmat.primitives.serialization import pkcs7
+
+        if signing_time is not None:
+            # cryptography always signs with the current time
+            from .SignedData import build_signed_data
+
+            return build_signed_data(
+                manifest,
+                self.certificate.public_bytes(serialization.Encoding.DER),
+                [self.wwdr_certificate.public_bytes(serialization.Encoding.DER)],
+                lambda data: self.key.sign(
+                    data, padding.PKCS1v15(), hashes.SHA256()
+                ),
+                signing_time=signing_time,
+            )
+        options = [
+            pkcs7.PKCS7Options.DetachedSignature,
+            pkcs7.PKCS7Options.Binary,
+        ]
+        return (
+            pkcs7.PKCS7SignatureBuilder()
+            .set_data(manifest)
+            .add_signer(self.certificate, self.key, hashes.SHA256())
+            .add_certificate(self.wwdr_certificate)
+            .sign(serialization.Encoding.DER, options)
+        )
+
+
+class KeyFileSigner(InMemorySigner):
+    """
+    Reads the certificates and the, optionally encrypted, key file
+    once and signs in memory afterwards
+    """
+
+    def __init__(
+        self,
+        certificate: str,
+        key: str,
+        wwdr_certificate: str,
+        password: Optional[Union[str, bytes]] = None,
+    ) -> None:
+        """
+        :param certificate: Path of the pass type certificate
+        :param key: Path of the private key
+        :param wwdr_certificate: Path of the Apple WWDR certificate
+        :param password: Optional password of the key
+        """
+        self.paths = (certificate, key, wwdr_certificate)
+        contents = []
+        for path in self.paths:
+            with open(path, "rb") as file_handle:
+                contents.append(file_handle.read())
+        super().__init__(*contents, password=password)
+
+
+def load_certificate(certificate):
+    """Load a PEM or DER certificate, loaded certificates are returned"""
+    if not isinstance(certificate, bytes):
+        return certificate
+    _require_cryptography()
+    from cryptography import x509
+
+    if certificate.lstrip().startswith(b"-----"):
+        return x509.load_pem_x509_certificate(certificate)
+    return x509.load_der_x509_certificate(certificate)
+
+
+def certificate_expiry(certificate):
+    """Expiry of a cryptography certificate as aware datetime"""
+    from datetime import timezone
+
+    expiry = getattr(certificate, "not_valid_after_utc", None)
+    if expiry is None:
+        expiry = certificate.not_valid_after.replace(tzinfo=timezone.utc)
+    return expiry
@@ -0,0 +1,135 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from wallet.exceptions import PassSigningException
+from .Signer import Signer
+
+MONTHS = (
+    "Jan", "Feb", "Mar", "Apr", "May", "Jun",
+    "Jul", "Aug", "Sep", "Oct", "Nov", "Dec",
+)
+
+
+class OpenSSLSigner(Signer):
+    """
+    Signs with the openssl command line tool, the certificates and
+    the key are read from files on every signature
+    """
+
+    def __init__(
+        self,
+        certificate: str,
+        key: str,
+        wwdr_certificate: str,
+        password: str = None,
+    ) -> None:
+        """
+        :param certificate: Path of the pass type certificate
+        :param key: Path of the private key
+        :param wwdr_certificate: Path of the Apple WWDR certificate
+        :param password: Optional password of the key
+        """
+        self.certificate = certificate
+        self.key = key
+        self.wwdr_certificate = wwdr_certificate
+        self.password = password
+
+    @property
+    def not_valid_after(self) -> datetime:
+        """Expiry of the pass type certificate as aware datetime"""
+        output = self._run(
+            [
+                "openssl",
+                "x509",
+                "-noout",
+                "-enddate",
+                "-in",
+                self.certificate,
+            ],
+            b"",
+        )
+        # notAfter=May  1 12:00:00 2025 GMT, month names are not localized
+        month, day, clock, year, _ = (
+            output.decode("ascii").strip().partition("=")[2].split()
+        )
+        hour, minute, second = (int(part) for part in clock.split(":"))
+        return datetime(
+            int(year),
+            MONTHS.index(month) + 1,
+            int(day),
+            hour,
+            minute,
+            second,
+            tzinfo=timezone.utc,
+        )
+
+    def _run(self, openssl_cmd, data: bytes) -> bytes:
+        import subprocess
+
+        process = subprocess.Popen(
+            openssl_cmd,
+            stderr=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stdin=subprocess.PIPE,
+        )
+        out_data, error = process.communicate(data)
+        if process.returncode != 0:
+            raise PassSigningException(error)
+        return out_data
+
+    def sign(
+        self, manifest: bytes, signing_time: Optional[datetime] = None
+    ) -> bytes:
+        if signing_time is not None:
+            return self._sign_at(manifest, signing_time)
+
+        openssl_cmd = [
+            "openssl",
+            "smime",
+            "-binary",
+            "-sign",
+            "-certfile",
+            self.wwdr_certificate,
+            "-signer",
+            self.certificate,
+            "-inkey",
+            self.key,
+            "-outform",
+            "DER",
+            "-passin",
+            f"pass:{self.password}",
+        ]
+        return self._run(openssl_cmd, manifest)
+
+    def _sign_at(self, manifest: bytes, signing_time: datetime) -> bytes:
+        """
+        openssl smime always signs with the current time, the signed
+        attributes are assembled here and only signed by openssl
+        """
+        from .SignedData import build_signed_data
+
+        certificates = []
+        for path in (self.certificate, self.wwdr_certificate):
+            try:
+                with open(path, "rb") as file_handle:
+                    certificates.append(file_handle.read())
+            except OSError as error:
+                raise PassSigningException(str(error)) from error
+        return build_signed_data(
+            manifest,
+            certificates[0],
+            certificates[1:],
+            lambda data: self._run(
+                [
+                    "openssl",
+                    "dgst",
+                    "-sha256",
+                    "-sign",
+                    self.key,
+                    "-passin",
+                    f"pass:{self.password}",
+                ],
+                data,
+            ),
+            signing_time=signing_time,
+        )
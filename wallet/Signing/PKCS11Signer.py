@@ -0,0 +1,96 @@
+from datetime import datetime
+from typing import Optional
+
+from .SessionPool import SessionPool
+from .SignedData import _load_asn1_certificate, build_signed_data
+from .Signer import Signer
+
+
+class PKCS11Signer(Signer):
+    """
+    Signs with a private key that stays on a PKCS#11 token (HSM),
+    SoftHSM can be used as local stand in
+
+    Token sessions are pooled, every concurrent signature borrows its
+    own logged in session with the key handle already looked up.
+    """
+
+    def __init__(
+        self,
+        library: str,
+        token_label: str,
+        pin: str,
+        key_label: str,
+        certificate: bytes,
+        wwdr_certificate: bytes,
+        pool_size: int = 4,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """
+        :param library: Path of the PKCS#11 module,
+            e.g. /usr/lib/softhsm/libsofthsm2.so
+        :param token_label: Label of the token
+        :param pin: User PIN of the token
+        :param key_label: Label of the private key on the token
+        :param certificate: Pass type certificate, PEM or DER
+        :param wwdr_certificate: Apple WWDR certificate, PEM or DER
+        :param pool_size: Maximum number of open sessions
+        :param timeout: Seconds to wait for a free session
+        """
+        try:
+            import pkcs11
+        except ImportError as error:
+            raise ImportError(
+                "PKCS#11 signing requires python-pkcs11, install it with:"
+                " pip install asn1crypto python-pkcs11"
+            ) from error
+
+        self.token = pkcs11.lib(library).get_token(token_label=token_label)
+        self.certificate = certificate
+        self.wwdr_certificate = wwdr_certificate
+        self._pin = pin
+        self._key_label = key_label
+        self._pool = SessionPool(
+            self._open_session,
+            size=pool_size,
+            close=lambda entry: entry[0].close(),
+            timeout=timeout,
+        )
+
+    @property
+    def not_valid_after(self) -> datetime:
+        """Expiry of the pass type certificate as aware datetime"""
+        certificate = _load_asn1_certificate(self.certificate)
+        return certificate["tbs_certificate"]["validity"]["not_after"].native
+
+    def _open_session(self):
+        from pkcs11 import ObjectClass
+
+        session = self.token.open(user_pin=self._pin)
+        try:
+            key = session.get_key(
+                object_class=ObjectClass.PRIVATE_KEY, label=self._key_label
+            )
+        except BaseException:
+            session.close()
+            raise
+        return session, key
+
+    def sign(
+        self, manifest: bytes, signing_time: Optional[datetime] = None
+    ) -> bytes:
+        from pkcs11 import Mechanism
+
+        with self._pool.acquire() as (_, key):
+            return build_signed_data(
+                manifest,
+                self.certificate,
+                [self.wwdr_certificate],
+                lambda data: key.sign(
+                    data, mechanism=Mechanism.SHA256_RSA_PKCS
+                ),
+                signing_time=signing_time,
+            )
+
+    def close(self) -> None:
+        self._pool.close()
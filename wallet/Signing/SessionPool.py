@@ -0,0 +1,105 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Generic, Iterator, List, Optional, TypeVar
+
+Session = TypeVar("Session")
+
+
+class SessionPool(Generic[Session]):
+    """
+    Thread safe pool of sessions, opened on demand up to size
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Session],
+        size: int = 4,
+        close: Optional[Callable[[Session], None]] = None,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """
+        :param factory: Opens a new session
+        :param size: Maximum number of open sessions
+        :param close: Closes a session
+        :param timeout: Seconds to wait for a free session,
+            Default wait forever
+        """
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self.factory = factory
+        self.size = size
+        self._close = close
+        self.timeout = timeout
+        self._idle: List[Session] = []
+        self._open = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    @property
+    def open_sessions(self) -> int:
+        """Number of sessions currently open"""
+        return self._open
+
+    @contextmanager
+    def acquire(self) -> Iterator[Session]:
+        """
+        Borrow a session, a session that raised or is returned
+        after close is closed instead of returned to the pool
+        """
+        session = self._get()
+        try:
+            yield session
+        except BaseException:
+            self._discard(session)
+            raise
+        with self._condition:
+            if not self._closed:
+                self._idle.append(session)
+                self._condition.notify()
+                return
+        self._discard(session)
+
+    def _get(self) -> Session:
+        deadline = None
+        if self.timeout is not None:
+            deadline = time.monotonic() + self.timeout
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Session pool is closed")
+                if self._idle:
+                    return self._idle.pop()
+                if self._open < self.size:
+                    self._open += 1
+                    break
+                remaining = None
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError("No session available")
+                self._condition.wait(remaining)
+        try:
+            return self.factory()
+        except BaseException:
+            self._discard(None)
+            raise
+
+    def _discard(self, session: Optional[Session]) -> None:
+        with self._condition:
+            self._open -= 1
+            self._condition.notify()
+        if session is not None and self._close is not None:
+            self._close(session)
+
+    def close(self) -> None:
+        """
+        Close all idle sessions, borrowed sessions are closed when
+        they are returned and no new sessions are handed out
+        """
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._condition.notify_all()
+        for session in idle:
+            self._discard(session)
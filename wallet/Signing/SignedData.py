@@ -0,0 +1,109 @@
+import hashlib
+from datetime import datetime, timezone
+from typing import Callable, Optional, Sequence
+
+
+def _load_asn1_certificate(certificate: bytes):
+    from asn1crypto import pem, x509
+
+    if pem.detect(certificate):
+        _, _, certificate = pem.unarmor(certificate)
+    return x509.Certificate.load(certificate)
+
+
+def _signing_time(signing_time: Optional[datetime]):
+    from asn1crypto import cms, core
+
+    if signing_time is None:
+        signing_time = datetime.now(timezone.utc)
+    elif signing_time.tzinfo is None:
+        signing_time = signing_time.replace(tzinfo=timezone.utc)
+    signing_time = signing_time.astimezone(timezone.utc).replace(microsecond=0)
+    # UTCTime covers 1950 to 2049, GeneralizedTime the years after
+    if 1950 <= signing_time.year < 2050:
+        return cms.Time({"utc_time": core.UTCTime(signing_time)})
+    return cms.Time({"generalized_time": core.GeneralizedTime(signing_time)})
+
+
+def build_signed_data(
+    manifest: bytes,
+    certificate: bytes,
+    chain: Sequence[bytes],
+    sign: Callable[[bytes], bytes],
+    signing_time: Optional[datetime] = None,
+) -> bytes:
+    """
+    Assemble a detached PKCS#7 signature in DER around an external
+    RSA SHA-256 signing function, e.g. a key on a token
+
+    :param manifest: manifest.json content
+    :param certificate: Signer certificate, PEM or DER
+    :param chain: Further certificates to embed, e.g. Apple WWDR
+    :param sign: Returns the PKCS#1 v1.5 SHA-256 signature of bytes
+    :param signing_time: Signing time of the signed attributes,
+        Default now
+    """
+    try:
+        from asn1crypto import algos, cms
+    except ImportError as error:
+        raise ImportError(
+            "Building PKCS#7 signatures requires asn1crypto, install it with:"
+            " pip install asn1crypto"
+        ) from error
+
+    signer_certificate = _load_asn1_certificate(certificate)
+    signed_attrs = cms.CMSAttributes(
+        [
+            cms.CMSAttribute({"type": "content_type", "values": ["data"]}),
+            cms.CMSAttribute(
+                {
+                    "type": "signing_time",
+                    "values": [_signing_time(signing_time)],
+                }
+            ),
+            cms.CMSAttribute(
+                {
+                    "type": "message_digest",
+                    "values": [hashlib.sha256(manifest).digest()],
+                }
+            ),
+        ]
+    )
+    signer_info = cms.SignerInfo(
+        {
+            "version": "v1",
+            "sid": cms.SignerIdentifier(
+                {
+                    "issuer_and_serial_number": cms.IssuerAndSerialNumber(
+                        {
+                            "issuer": signer_certificate.issuer,
+                            "serial_number": signer_certificate.serial_number,
+                        }
+                    )
+                }
+            ),
+            "digest_algorithm": algos.DigestAlgorithm({"algorithm": "sha256"}),
+            "signed_attrs": signed_attrs,
+            "signature_algorithm": algos.SignedDigestAlgorithm(
+                {"algorithm": "rsassa_pkcs1v15"}
+            ),
+            # The signature covers the attributes encoded as SET OF
+            "signature": sign(signed_attrs.dump()),
+        }
+    )
+
+    signed_data = cms.SignedData(
+        {
+            "version": "v1",
+            "digest_algorithms": [
+                algos.DigestAlgorithm({"algorithm": "sha256"})
+            ],
+            "encap_content_info": {"content_type": "data"},
+            "certificates": [signer_certificate]
+            + [_load_asn1_certificate(c) for c in chain],
+            "signer_infos": [signer_info],
+        }
+    )
+    return cms.ContentInfo(
+        {"content_type": "signed_data", "content": signed_data}
+    ).dump()
@@ -0,0 +1,32 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Optional
+
+
+class Signer(ABC):
+    """
+    Signs the manifest.json of a pass
+
+    Backends return the detached PKCS#7 signature in DER and must be
+    safe to use from several threads at once.
+    """
+
+    @abstractmethod
+    def sign(
+        self, manifest: bytes, signing_time: Optional[datetime] = None
+    ) -> bytes:
+        """
+        Return the signature of the manifest
+        :param manifest: manifest.json content
+        :param signing_time: Signing time of the signed attributes,
+            Default now. Pinning it makes the signature reproducible.
+        """
+
+    def close(self) -> None:
+        """Release sessions and other resources of the backend"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
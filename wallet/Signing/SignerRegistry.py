@@ -0,0 +1,327 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterator, Optional, Sequence, Tuple
+
+from wallet.exceptions import PassSigningException
+from .Signer import Signer
+
+Loader = Callable[[], Signer]
+
+
+class _Tenant:
+    """Registration of a pass type identifier"""
+
+    __slots__ = ("loader", "team_identifier", "watch", "lock")
+
+    def __init__(self, loader, team_identifier, watch):
+        self.loader = loader
+        self.team_identifier = team_identifier
+        self.watch = tuple(watch)
+        self.lock = threading.Lock()
+
+
+class _Loaded:
+    """Loaded signer with the state of its files"""
+
+    __slots__ = (
+        "signer", "stamps", "expires", "used", "checked", "leases", "retired"
+    )
+
+    def __init__(self, signer, stamps, expires, now):
+        self.signer = signer
+        self.stamps = stamps
+        self.expires = expires
+        self.used = now
+        self.checked = now
+        self.leases = 0
+        self.retired = False
+
+
+def _stamps(paths: Sequence[str]) -> Tuple:
+    stamps = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            stamps.append((stat.st_mtime_ns, stat.st_size, stat.st_ino))
+        except OSError:
+            stamps.append(None)
+    return tuple(stamps)
+
+
+class SignerRegistry:
+    """
+    Signers of many pass type identifiers
+
+    Signers are loaded on first use and kept in an LRU cache, idle
+    signers are evicted. Watched certificate and key files are checked
+    for rotation and certificates for expiry.
+    """
+
+    def __init__(
+        self,
+        max_signers: int = 128,
+        idle_timeout: Optional[float] = None,
+        check_interval: float = 5.0,
+        expiry_margin: timedelta = timedelta(0),
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        :param max_signers: Number of signers kept loaded
+        :param idle_timeout: Seconds after which an unused signer
+            is evicted, Default never
+        :param check_interval: Seconds between checks of the watched
+            files of a signer
+        :param expiry_margin: Refuse certificates that expire
+            within this margin
+        :param clock: Returns the current time in seconds
+        """
+        self.max_signers = max_signers
+        self.idle_timeout = idle_timeout
+        self.check_interval = check_interval
+        self.expiry_margin = expiry_margin
+        self.clock = clock
+        self._tenants: Dict[str, _Tenant] = {}
+        self._loaded: "OrderedDict[str, _Loaded]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        pass_type_identifier: str,
+        loader: Loader,
+        team_identifier: Optional[str] = None,
+        watch: Sequence[str] = (),
+    ) -> None:
+        """
+        Register how to load the signer of a pass type identifier,
+        a loaded signer of a previous registration is evicted
+        :param pass_type_identifier: Pass type identifier
+        :param loader: Returns the Signer
+        :param team_identifier: Optional team identifier of the
+            certificate, passes of other teams are refused
+        :param watch: Paths of files, the signer is reloaded
+            when they change
+        """
+        with self._lock:
+            self._tenants[pass_type_identifier] = _Tenant(
+                loader, team_identifier, watch
+            )
+        self.evict(pass_type_identifier)
+
+    def register_files(
+        self,
+        pass_type_identifier: str,
+        certificate: str,
+        key: str,
+        wwdr_certificate: str,
+        password: Optional[str] = None,
+        team_identifier: Optional[str] = None,
+    ) -> None:
+        """
+        Register certificate and key files, read once into a
+        KeyFileSigner and reloaded when they change on disk
+        """
+        from .InMemorySigner import KeyFileSigner
+
+        self.register(
+            pass_type_identifier,
+            lambda: KeyFileSigner(certificate, key, wwdr_certificate, password),
+            team_identifier=team_identifier,
+            watch=(certificate, key, wwdr_certificate),
+        )
+
+    def unregister(self, pass_type_identifier: str) -> None:
+        """Forget a pass type identifier and close its signer"""
+        with self._lock:
+            self._tenants.pop(pass_type_identifier, None)
+        self.evict(pass_type_identifier)
+
+    def __contains__(self, pass_type_identifier: str) -> bool:
+        return pass_type_identifier in self._tenants
+
+    def __len__(self) -> int:
+        return len(self._loaded)
+
+    def team_identifier(self, pass_type_identifier: str) -> Optional[str]:
+        """Team identifier registered for a pass type identifier"""
+        return self._tenant(pass_type_identifier).team_identifier
+
+    def signer_for(
+        self, pass_type_identifier: str, team_identifier: Optional[str] = None
+    ) -> Signer:
+        """
+        Return the signer of a pass type identifier, loads it if needed.
+        The signer may be closed once it is evicted, use lease to sign
+        while other threads use the registry.
+        :param pass_type_identifier: Pass type identifier of the pass
+        :param team_identifier: Optional team identifier of the pass,
+            checked against the registration
+        """
+        loaded = self._acquire(pass_type_identifier, team_identifier, 0)
+        return loaded.signer
+
+    @contextmanager
+    def lease(
+        self, pass_type_identifier: str, team_identifier: Optional[str] = None
+    ) -> Iterator[Signer]:
+        """
+        Borrow the signer of a pass type identifier, an evicted signer
+        is only closed after its last lease ended
+        :param pass_type_identifier: Pass type identifier of the pass
+        :param team_identifier: Optional team identifier of the pass,
+            checked against the registration
+        """
+        loaded = self._acquire(pass_type_identifier, team_identifier, 1)
+        try:
+            yield loaded.signer
+        finally:
+            self._release(loaded)
+
+    def _acquire(
+        self,
+        pass_type_identifier: str,
+        team_identifier: Optional[str],
+        leases: int,
+    ) -> _Loaded:
+        tenant = self._tenant(pass_type_identifier)
+        if (
+            team_identifier is not None
+            and tenant.team_identifier is not None
+            and team_identifier != tenant.team_identifier
+        ):
+            raise PassSigningException(
+                f"Team identifier {team_identifier} does not match"
+                f" {pass_type_identifier}"
+            )
+        now = self.clock()
+        self._evict_idle(now)
+        with self._lock:
+            loaded = self._loaded.get(pass_type_identifier)
+            if loaded is not None:
+                self._loaded.move_to_end(pass_type_identifier)
+                loaded.used = now
+                loaded.leases += leases
+        if loaded is None:
+            loaded = self._load(pass_type_identifier, tenant, None, now, leases)
+        elif self._outdated(tenant, loaded, now):
+            self._release(loaded, leases)
+            loaded = self._load(pass_type_identifier, tenant, loaded, now, leases)
+        if loaded.expires is not None:
+            limit = datetime.fromtimestamp(now, timezone.utc) + self.expiry_margin
+            if loaded.expires <= limit:
+                self._release(loaded, leases)
+                raise PassSigningException(
+                    f"Certificate of {pass_type_identifier} expires"
+                    f" {loaded.expires.isoformat()}"
+                )
+        return loaded
+
+    def _release(self, loaded: _Loaded, leases: int = 1) -> None:
+        with self._lock:
+            loaded.leases -= leases
+            close = loaded.retired and loaded.leases == 0 and leases > 0
+        if close:
+            loaded.signer.close()
+
+    def _retire(self, entries) -> None:
+        """Close evicted signers now or when their last lease ends"""
+        closable = []
+        with self._lock:
+            for entry in entries:
+                entry.retired = True
+                if entry.leases == 0:
+                    closable.append(entry)
+        for entry in closable:
+            entry.signer.close()
+
+    def evict(self, pass_type_identifier: str) -> None:
+        """Close and forget the loaded signer of a pass type identifier"""
+        with self._lock:
+            loaded = self._loaded.pop(pass_type_identifier, None)
+        if loaded is not None:
+            self._retire([loaded])
+
+    def close(self) -> None:
+        """Close and forget all loaded signers"""
+        with self._lock:
+            loaded, self._loaded = self._loaded, OrderedDict()
+        self._retire(loaded.values())
+
+    def _tenant(self, pass_type_identifier: str) -> _Tenant:
+        tenant = self._tenants.get(pass_type_identifier)
+        if tenant is None:
+            raise PassSigningException(
+                f"No signer registered for {pass_type_identifier}"
+            )
+        return tenant
+
+    def _outdated(self, tenant: _Tenant, loaded: _Loaded, now: float) -> bool:
+        if not tenant.watch or now - loaded.checked < self.check_interval:
+            return False
+        loaded.checked = now
+        return _stamps(tenant.watch) != loaded.stamps
+
+    def _load(
+        self,
+        pass_type_identifier: str,
+        tenant: _Tenant,
+        previous: Optional[_Loaded],
+        now: float,
+        leases: int,
+    ) -> _Loaded:
+        # One load per tenant at a time, other tenants are not blocked
+        with tenant.lock:
+            with self._lock:
+                current = self._loaded.get(pass_type_identifier)
+                if current is not None and current is not previous:
+                    current.leases += leases
+                    return current
+            stamps = _stamps(tenant.watch)
+            signer = tenant.loader()
+            expires = getattr(signer, "not_valid_after", None)
+            loaded = _Loaded(signer, stamps, expires, now)
+            loaded.leases = leases
+            evicted = []
+            with self._lock:
+                if self._tenants.get(pass_type_identifier) is tenant:
+                    self._loaded[pass_type_identifier] = loaded
+                    self._loaded.move_to_end(pass_type_identifier)
+                    while len(self._loaded) > self.max_signers:
+                        evicted.append(self._loaded.popitem(last=False)[1])
+                else:
+                    # Unregistered meanwhile, closed after its last lease
+                    loaded.retired = True
+        if previous is not None and current is previous:
+            # Rotated, the replaced signer is no longer cached
+            evicted.append(previous)
+        self._retire(evicted)
+        return loaded
+
+    def _evict_idle(self, now: float) -> None:
+        if self.idle_timeout is None:
+            return
+        evicted = []
+        with self._lock:
+            while self._loaded:
+                name, oldest = next(iter(self._loaded.items()))
+                if now - oldest.used < self.idle_timeout:
+                    break
+                evicted.append(self._loaded.pop(name))
+        self._retire(evicted)
+
+
+_default_registry = None
+
+
+def get_default_registry() -> SignerRegistry:
+    """
+    Registry used by Pass.create when neither a signer nor
+    certificates are given
+    """
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = SignerRegistry()
+    return _default_registry
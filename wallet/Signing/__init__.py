@@ -0,0 +1,7 @@
+from .Signer import Signer
+from .SessionPool import SessionPool
+from .OpenSSLSigner import OpenSSLSigner
+from .InMemorySigner import InMemorySigner, KeyFileSigner
+from .SignedData import build_signed_data
+from .PKCS11Signer import PKCS11Signer
+from .SignerRegistry import SignerRegistry, get_default_registry
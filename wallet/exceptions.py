@@ -7,3 +7,19 @@ class PassParameterException(Exception):
     """
     Parameter based Exception
     """
+
+
+class PassValidationException(PassParameterException):
+    """
+    Schema based Exception, holds every violation found in the pass
+    """
+
+    def __init__(self, errors):
+        self.errors = list(errors)
+        super().__init__("; ".join(self.errors))
+
+
+class PassSigningException(Exception):
+    """
+    Signing based Exception
+    """
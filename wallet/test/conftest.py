@@ -0,0 +1,80 @@
+import subprocess
+
+from wallet.PassStyles import StoreCard
+from wallet.Pass import Pass
+from pytest import fixture
+
+SHARK_ICON = "wallet/test/test_assets/_shark-icon.png"
+SEA_IMG = "wallet/test/test_assets/_sea.jpg"
+
+
+@fixture(scope="session")
+def shark_icon():
+    return SHARK_ICON
+
+
+@fixture(scope="session")
+def sea_img():
+    return SEA_IMG
+
+
+@fixture(scope="session")
+def pass_assets():
+    """Icon and strip image files of a pass"""
+    return {"icon.png": SHARK_ICON, "strip.png": SEA_IMG}
+
+
+@fixture(scope="session")
+def make_pass():
+    """
+    Factory of passes of pass.com.example, a StoreCard by default,
+    files maps names in the pass to paths read into memory,
+    other arguments are passed to Pass
+    """
+
+    def make(card=None, serial_number="12345", files=None, **kwargs):
+        pass_file = Pass(
+            card if card is not None else StoreCard(),
+            "pass.com.example",
+            "team_identifier",
+            "organization_name",
+            serial_number=serial_number,
+            **kwargs
+        )
+        for name, path in (files or {}).items():
+            with open(path, "rb") as file_handle:
+                pass_file.add_file(name, file_handle.read())
+        return pass_file
+
+    return make
+
+
+@fixture(scope="session")
+def certificate(tmp_path_factory):
+    """Self signed pass type certificate and unencrypted key paths"""
+    path = tmp_path_factory.mktemp("certificate")
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+            "-keyout", str(path / "key.pem"), "-out", str(path / "cert.pem"),
+            "-subj", "/CN=pass.com.example", "-days", "1",
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return str(path / "cert.pem"), str(path / "key.pem")
+
+
+@fixture(scope="session")
+def encrypted_key(certificate, tmp_path_factory):
+    """Key of the certificate fixture encrypted with password secret"""
+    path = tmp_path_factory.mktemp("encrypted") / "key.pem"
+    subprocess.run(
+        [
+            "openssl", "pkey", "-in", certificate[1], "-aes256",
+            "-passout", "pass:secret", "-out", str(path),
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return str(path)
@@ -0,0 +1,80 @@
+from wallet.PassStyles import StoreCard
+from wallet.Pass import Pass
+from wallet.PassProps import (
+    Barcode,
+    BarcodeFormat,
+    BarcodePayloadGenerator,
+    HMACPayloadGenerator,
+    PlainPayloadGenerator,
+)
+from wallet.PassProps.BarcodePreview import BarcodePreview
+from pytest import importorskip, raises
+
+
+def test_message_encoding_is_configurable():
+    barcode = Barcode("Grüße", message_encoding="utf-8")
+    assert barcode.json_dict()["messageEncoding"] == "utf-8"
+    assert barcode.encoded_message() == "Grüße".encode("utf-8")
+    assert Barcode("123").messageEncoding == "iso-8859-1"
+
+
+def test_hmac_payloads():
+    generator = HMACPayloadGenerator(b"secret", digest_size=8)
+    payloads = generator.generate_many(["ticket-1", "ticket-2"])
+    assert payloads == [generator.generate("ticket-1"), generator.generate("ticket-2")]
+    assert payloads[0].startswith("ticket-1.")
+    assert generator.verify(payloads[0])
+    assert not generator.verify("ticket-2." + payloads[0].split(".")[1])
+    assert not HMACPayloadGenerator(b"other", digest_size=8).verify(payloads[0])
+
+
+def test_generator_must_implement_generate():
+    class Incomplete(BarcodePayloadGenerator):
+        pass
+
+    with raises(TypeError):
+        Incomplete()
+
+
+def test_apply_to_passes():
+    passes = [
+        Pass(StoreCard(), "pass_type_identifier", "team_identifier",
+             "organization_name", serial_number=str(i))
+        for i in range(3)
+    ]
+    PlainPayloadGenerator().apply(
+        passes,
+        qr_format=BarcodeFormat.PDF417,
+        alt_text=lambda message: f"No. {message}",
+    )
+    assert [p.json_dict()["barcodes"] for p in passes][2] == [
+        {
+            "format": BarcodeFormat.PDF417,
+            "message": "2",
+            "messageEncoding": "iso-8859-1",
+            "altText": "No. 2",
+        }
+    ]
+
+
+def test_preview_cache():
+    rendered = []
+
+    def render(data, scale):
+        rendered.append(data)
+        return b"png" + data
+
+    preview = BarcodePreview({BarcodeFormat.AZTEC: render}, maxsize=2)
+    barcode = Barcode("abc", BarcodeFormat.AZTEC)
+    assert preview.render(barcode) == b"pngabc"
+    assert preview.render(Barcode("abc", BarcodeFormat.AZTEC)) == b"pngabc"
+    assert rendered == [b"abc"]
+    assert preview.cache_info().hits == 1
+    with raises(ValueError):
+        preview.render(Barcode("abc", BarcodeFormat.PDF417))
+
+
+def test_qr_preview():
+    importorskip("segno")
+    png = BarcodePreview().render(Barcode("abc"), scale=2)
+    assert png.startswith(b"\x89PNG")
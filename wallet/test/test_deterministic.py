@@ -0,0 +1,86 @@
+import subprocess
+import zipfile
+from datetime import datetime, timezone
+
+from wallet.PassStyles import StoreCard
+from wallet.Schemas.FieldProps import FieldProps
+from wallet.utils.helpers import generate_serial_number
+from wallet.exceptions import PassParameterException
+from pytest import importorskip, raises
+
+
+def balance_card():
+    card = StoreCard()
+    card.add_primary_field(FieldProps(key="balance", value="10"))
+    return card
+
+
+def test_default_serial_number_is_generated_per_pass(make_pass):
+    assert (
+        make_pass(balance_card(), serial_number=None).serialNumber
+        != make_pass(balance_card(), serial_number=None).serialNumber
+    )
+
+
+def test_generate_serial_number():
+    serial = generate_serial_number("pass.com.example", "customer", 42)
+    assert serial == generate_serial_number("pass.com.example", "customer", 42)
+    assert serial != generate_serial_number("pass.com.example", "customer", 43)
+
+
+SIGNING_TIME = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def test_deterministic_archive(certificate, tmp_path, make_pass, pass_assets):
+    importorskip("asn1crypto")
+    from asn1crypto import cms
+
+    cert, key = certificate
+    serial = generate_serial_number("pass.com.example", "customer", 42)
+    archives = [
+        make_pass(balance_card(), serial_number=serial, files=pass_assets)
+        .create(cert, key, cert, deterministic=True, signing_time=SIGNING_TIME)
+        .getvalue()
+        for _ in range(2)
+    ]
+    assert archives[0] == archives[1]
+
+    z_file = zipfile.ZipFile(
+        make_pass(balance_card(), serial_number=serial, files=pass_assets).create(
+            cert, key, cert, deterministic=True, signing_time=SIGNING_TIME
+        )
+    )
+    assert z_file.namelist() == [
+        "signature", "manifest.json", "pass.json", "icon.png", "strip.png"
+    ]
+    assert {info.date_time for info in z_file.infolist()} == {(1980, 1, 1, 0, 0, 0)}
+    assert z_file.read("manifest.json").startswith(b'{"icon.png"')
+    assert z_file.read("pass.json").startswith(b'{"description"')
+
+    # The signature keeps its signed attributes and verifies
+    (tmp_path / "signature").write_bytes(z_file.read("signature"))
+    (tmp_path / "manifest.json").write_bytes(z_file.read("manifest.json"))
+    subprocess.run(
+        [
+            "openssl", "smime", "-verify", "-binary", "-inform", "DER",
+            "-in", str(tmp_path / "signature"),
+            "-content", str(tmp_path / "manifest.json"),
+            "-CAfile", cert, "-purpose", "any",
+        ],
+        check=True,
+        capture_output=True,
+    )
+    signer_info = cms.ContentInfo.load(z_file.read("signature"))["content"][
+        "signer_infos"
+    ][0]
+    attributes = {
+        attribute["type"].native: attribute["values"][0].native
+        for attribute in signer_info["signed_attrs"]
+    }
+    assert attributes["signing_time"] == SIGNING_TIME
+
+
+def test_deterministic_requires_signing_time(certificate, make_pass):
+    cert, key = certificate
+    with raises(PassParameterException):
+        make_pass(balance_card()).create(cert, key, cert, deterministic=True)
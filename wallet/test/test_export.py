@@ -0,0 +1,206 @@
+import hashlib
+import json
+import tarfile
+import zipfile
+
+from wallet.PassStyles import StoreCard
+from wallet.Pass import Pass
+from wallet.Signing import Signer
+from wallet.Export import (
+    BatchExporter,
+    LocalObjectStore,
+    ObjectStore,
+    ObjectStoreSink,
+    Sink,
+    TarSink,
+    ZipSink,
+)
+from pytest import mark, raises
+
+
+class FakeSigner(Signer):
+    def sign(self, manifest, signing_time=None):
+        return b"signature"
+
+
+def passes(count, fail_at=None):
+    for i in range(count):
+        if i == fail_at:
+            raise RuntimeError("generator failed")
+        yield f"{i}.pkpass", f"pass {i}".encode() * 100
+
+
+def read_index(path):
+    with open(path) as file_handle:
+        return [json.loads(line) for line in file_handle]
+
+
+def test_tar_export_with_passes(tmp_path):
+    items = [
+        (
+            f"{i}.pkpass",
+            Pass(StoreCard(), "pass.com.example", "team_identifier",
+                 "organization_name", serial_number=str(i)),
+        )
+        for i in range(3)
+    ]
+    exporter = BatchExporter(
+        TarSink(str(tmp_path / "passes.tar")), str(tmp_path / "index.jsonl")
+    )
+    result = exporter.export(items, signer=FakeSigner())
+    assert result == (3, 0, True)
+
+    with tarfile.open(tmp_path / "passes.tar") as tar:
+        assert tar.getnames() == ["0.pkpass", "1.pkpass", "2.pkpass", "index.jsonl"]
+        data = tar.extractfile("1.pkpass").read()
+        assert zipfile.ZipFile(tar.extractfile("1.pkpass")).read("signature") == b"signature"
+        index = [json.loads(line) for line in tar.extractfile("index.jsonl")]
+    assert index[1]["sha1"] == hashlib.sha1(data).hexdigest()
+    assert index == read_index(tmp_path / "index.jsonl")
+
+
+def test_back_pressure(tmp_path):
+    pulled = []
+    lag = []
+
+    class RecordingSink(Sink):
+        written = 0
+
+        def write(self, name, data):
+            self.written += 1
+            lag.append(len(pulled) - self.written)
+            return {}
+
+    def generate():
+        for name, data in passes(50):
+            pulled.append(name)
+            yield name, data
+
+    BatchExporter(
+        RecordingSink(), str(tmp_path / "index.jsonl"), max_pending=4,
+        index_name=None,
+    ).export(generate())
+    assert len(pulled) == 50
+    assert max(lag) <= 4
+
+
+def resume(tmp_path, sink_factory):
+    exporter = BatchExporter(
+        sink_factory(),
+        str(tmp_path / "index.jsonl"),
+        checkpoint=str(tmp_path / "checkpoint.json"),
+        checkpoint_every=3,
+        max_pending=2,
+    )
+    with raises(RuntimeError):
+        exporter.export(passes(10, fail_at=8))
+    assert exporter.load_checkpoint()["completed"] <= 8
+
+    exporter.sink = sink_factory()
+    skipped = exporter.load_checkpoint()["completed"]
+    assert skipped > 0
+    assert exporter.export(passes(10)) == (10 - skipped, skipped, True)
+    assert exporter.export(passes(10)) == (0, 10, True)
+    index = read_index(tmp_path / "index.jsonl")
+    assert [entry["name"] for entry in index] == [f"{i}.pkpass" for i in range(10)]
+    return index
+
+
+def test_resume_tar(tmp_path):
+    index = resume(tmp_path, lambda: TarSink(str(tmp_path / "passes.tar")))
+    with tarfile.open(tmp_path / "passes.tar") as tar:
+        names = tar.getnames()
+        assert names == [f"{i}.pkpass" for i in range(10)] + ["index.jsonl"]
+        member = tar.getmember("7.pkpass")
+        assert member.offset == index[7]["offset"]
+        assert tar.extractfile(member).read() == b"pass 7" * 100
+
+
+def test_resume_zip(tmp_path):
+    resume(tmp_path, lambda: ZipSink(str(tmp_path / "passes.zip")))
+    with zipfile.ZipFile(tmp_path / "passes.zip") as z_file:
+        assert z_file.testzip() is None
+        assert z_file.namelist() == [f"{i}.pkpass" for i in range(10)] + ["index.jsonl"]
+        assert z_file.read("2.pkpass") == b"pass 2" * 100
+
+
+class DiskFull:
+    """Source that fails after the archive wrote the entry header"""
+
+    def read(self, *args):
+        raise OSError("No space left on device")
+
+
+class FailingTarSink(TarSink):
+    def write(self, name, data):
+        if name == "4.pkpass":
+            self._tar.addfile(self._member(name, len(data)), DiskFull())
+        return super().write(name, data)
+
+
+class FailingZipSink(ZipSink):
+    def write(self, name, data):
+        if name == "4.pkpass":
+            with self._zip.open(self._entry(name, len(data)), "w") as target:
+                target.write(data[:10])
+                target.write(DiskFull().read())
+        return super().write(name, data)
+
+
+@mark.parametrize(
+    "sink_class, failing_class, file_name",
+    [
+        (TarSink, FailingTarSink, "passes.tar"),
+        (ZipSink, FailingZipSink, "passes.zip"),
+    ],
+)
+def test_resume_after_partial_write(tmp_path, sink_class, failing_class, file_name):
+    path = str(tmp_path / file_name)
+    exporter = BatchExporter(
+        failing_class(path),
+        str(tmp_path / "index.jsonl"),
+        checkpoint=str(tmp_path / "checkpoint.json"),
+        checkpoint_every=3,
+        max_pending=2,
+    )
+    with raises(OSError):
+        exporter.export(passes(10))
+    assert exporter.load_checkpoint()["completed"] == 4
+
+    exporter.sink = sink_class(path)
+    assert exporter.export(passes(10)) == (6, 4, True)
+    expected = [f"{i}.pkpass" for i in range(10)] + ["index.jsonl"]
+    if sink_class is ZipSink:
+        with zipfile.ZipFile(path) as z_file:
+            assert z_file.testzip() is None
+            assert z_file.namelist() == expected
+            assert z_file.read("4.pkpass") == b"pass 4" * 100
+    else:
+        with tarfile.open(path) as tar:
+            assert tar.getnames() == expected
+            assert tar.extractfile("4.pkpass").read() == b"pass 4" * 100
+
+
+def test_object_store_sink(tmp_path):
+    store = LocalObjectStore(str(tmp_path / "bucket"))
+    BatchExporter(
+        ObjectStoreSink(store, prefix="event-42/"), str(tmp_path / "index.jsonl")
+    ).export(passes(3))
+    assert store.get("event-42/1.pkpass") == b"pass 1" * 100
+    assert read_index(tmp_path / "index.jsonl")[2]["key"] == "event-42/2.pkpass"
+    assert store.get("event-42/index.jsonl").count(b"\n") == 3
+    with raises(ValueError):
+        store.put("../outside", b"")
+
+
+def test_incomplete_backends_fail_on_creation():
+    class IncompleteSink(Sink):
+        pass
+
+    class IncompleteStore(ObjectStore):
+        pass
+
+    with raises(TypeError):
+        IncompleteSink()
+    with raises(TypeError):
+        IncompleteStore()
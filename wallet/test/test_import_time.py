@@ -0,0 +1,99 @@
+import os
+import re
+import subprocess
+import sys
+
+from wallet.PassStyles import StoreCard
+from wallet.Pass import Pass
+from wallet.PassProps.Field import DateField
+from pytest import mark
+
+# Opt in cold start budget of `import wallet.Pass`, best of a few runs,
+# wall clock timings are too noisy on shared runners for the default run
+IMPORT_BUDGET_MS = os.environ.get("WALLET_IMPORT_BUDGET_MS")
+
+HEAVY_MODULES = [
+    "pydantic",
+    "subprocess",
+    "tempfile",
+    "zipfile",
+    "shutil",
+    "pathlib",
+    "decimal",
+    "uuid",
+    "hashlib",
+    "concurrent.futures",
+    "wallet.Manifest",
+    "wallet.PassProps.BarcodePayload",
+    "wallet.PassProps.BarcodePreview",
+]
+
+
+def run_python(code, *options):
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_heavy_modules_are_not_imported():
+    output = run_python(
+        "import sys, wallet.Pass, wallet.PassStyles\n"
+        f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+    )
+    assert output.stdout.strip() == "[]"
+
+
+def test_lazy_exports_do_not_depend_on_import_order():
+    output = run_python(
+        "import inspect\n"
+        "import wallet.PassProps.BarcodePayload\n"
+        "import wallet.PassProps.BarcodePreview\n"
+        "import wallet.Schemas.FieldProps\n"
+        "from wallet import PassProps\n"
+        "print(all(inspect.isclass(getattr(PassProps, name))"
+        " for name in PassProps._LAZY))"
+    )
+    assert output.stdout.strip() == "True"
+
+
+@mark.skipif(
+    not IMPORT_BUDGET_MS, reason="set WALLET_IMPORT_BUDGET_MS to run"
+)
+def test_import_time_benchmark():
+    timings = []
+    for _ in range(3):
+        output = run_python("import wallet.Pass", "-X", "importtime")
+        match = re.search(r"\|\s*(\d+) \| wallet\.Pass$", output.stderr, re.M)
+        timings.append(int(match.group(1)) / 1000)
+    assert min(timings) < float(IMPORT_BUDGET_MS)
+
+
+def test_pass_without_pydantic():
+    card = StoreCard()
+    card.add_primary_field(key="balance", value="10", label="Balance")
+    card.backFields.append(
+        DateField(key="date", value="2020-01-01", date_style="long")
+    )
+    pass_file = Pass(
+        card, "pass_type_identifier", "team_identifier", "organization_name"
+    )
+    data = pass_file.json_dict()
+    assert data["storeCard"]["primaryFields"] == [
+        {
+            "key": "balance",
+            "value": "10",
+            "label": "Balance",
+            "attributedValue": None,
+            "textAlignment": "PKTextAlignmentLeft",
+        }
+    ]
+    assert data["storeCard"]["backFields"][0]["dateStyle"] == "PKDateStyleLong"
+    assert "pydantic" not in run_python(
+        "import sys\n"
+        "from wallet.PassStyles import StoreCard\n"
+        "StoreCard().add_primary_field(key='balance', value='10')\n"
+        "print(list(sys.modules))"
+    ).stdout
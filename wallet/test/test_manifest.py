@@ -0,0 +1,62 @@
+import hashlib
+from io import BytesIO
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from wallet.Manifest import Manifest, file_digest
+from pytest import raises
+
+
+def read(path):
+    with open(path, "rb") as file_handle:
+        return file_handle.read()
+
+
+def test_path_backed_files_give_same_manifest(make_pass, pass_assets):
+    in_memory = make_pass(files=pass_assets)
+    path_backed = make_pass()
+    for name, path in pass_assets.items():
+        path_backed.add_file_path(name, path)
+
+    pass_json = in_memory._create_pass_json()
+    assert in_memory._create_manifest(pass_json) == path_backed._create_manifest(
+        pass_json
+    )
+
+
+def test_add_missing_file_path(make_pass):
+    with raises(FileNotFoundError):
+        make_pass().add_file_path("icon.png", "wallet/test/logo.png")
+
+
+def test_parallel_hashing_keeps_order(sea_img):
+    files = {f"{i}.png": bytes([i]) * 1024 for i in range(32)}
+    files["strip.png"] = Path(sea_img)
+    serial = Manifest(parallel_threshold=float("inf")).hashes(b"{}", files)
+    with ThreadPoolExecutor(4) as executor:
+        parallel = Manifest(executor, parallel_threshold=0).hashes(b"{}", files)
+    assert list(parallel.items()) == list(serial.items())
+    assert list(parallel) == ["pass.json", *files]
+    assert parallel["strip.png"] == hashlib.sha1(read(sea_img)).hexdigest()
+
+
+def test_precomputed_digests_are_not_rehashed(make_pass):
+    pass_file = make_pass()
+    pass_file.add_file("icon.png", b"icon", digest="0" * 40)
+    pass_file.add_file("logo.png", b"logo")
+    pass_file._create_manifest(b"{}")
+    assert pass_file._hashes["icon.png"] == "0" * 40
+    assert pass_file._hashes["logo.png"] == file_digest(b"logo")
+
+
+def test_zip_with_path_backed_files(make_pass, sea_img):
+    pass_file = make_pass()
+    pass_file.add_file_path("strip.png", sea_img)
+    for deterministic in (False, True):
+        archive = zipfile.ZipFile(
+            pass_file._create_zip(
+                b"{}", b"{}", b"", BytesIO(), deterministic=deterministic
+            )
+        )
+        assert archive.read("strip.png") == read(sea_img)
@@ -0,0 +1,72 @@
+from io import BytesIO
+
+from wallet.PassStyles import StoreCard
+from wallet.PassProps import Barcode, Location
+from wallet.PassDiff import PassState, diff_passes
+
+
+def balance_card(balance="10", points="5"):
+    card = StoreCard()
+    card.add_primary_field(
+        key="balance", value=balance, change_message="Balance is now %@"
+    )
+    card.add_secondary_field(key="points", value=points)
+    card.add_back_field(key="terms", value="Terms")
+    return card
+
+
+def test_identical_passes(make_pass, pass_assets):
+    changes = diff_passes(
+        make_pass(balance_card(), files=pass_assets),
+        make_pass(balance_card(), files=pass_assets),
+    )
+    assert not changes
+    assert changes.as_dict() == {}
+
+
+def test_field_changes_and_messages(make_pass, pass_assets):
+    changes = diff_passes(
+        make_pass(balance_card(), files=pass_assets),
+        make_pass(balance_card(balance="20", points="6"), files=pass_assets),
+    )
+    assert changes.requires_update
+    assert [(c.key, c.area) for c in changes.fields] == [
+        ("balance", "primaryFields"),
+        ("points", "secondaryFields"),
+    ]
+    assert changes.fields[1].old["value"] == "5"
+    assert changes.change_messages == ["Balance is now 20"]
+    assert set(changes.as_dict()) == {"fields"}
+
+
+def test_barcodes_relevance_and_assets(make_pass, pass_assets, shark_icon):
+    changes = diff_passes(
+        make_pass(balance_card(), files=pass_assets, barcodes=[Barcode("1")]),
+        make_pass(
+            balance_card(),
+            files={**pass_assets, "strip.png": shark_icon},
+            barcodes=[Barcode("2")],
+            locations=[Location(latitude=1, longitude=2)],
+            logo_text="Sharks",
+        ),
+    )
+    assert [c.key for c in changes.barcodes] == ["barcodes"]
+    assert [c.key for c in changes.relevance] == ["locations"]
+    assert [c.key for c in changes.assets] == ["strip.png"]
+    assert changes.keys == [("logoText", None, "Sharks")]
+    assert not changes.fields
+
+
+def test_diff_against_archive(make_pass, pass_assets):
+    archive = BytesIO()
+    old = make_pass(balance_card(), files=pass_assets)
+    pass_json = old._create_pass_json()
+    old._create_zip(pass_json, old._create_manifest(pass_json), b"", archive)
+
+    state = PassState.from_archive(archive.getvalue())
+    assert set(state.digests) == {"icon.png", "strip.png"}
+    assert not diff_passes(archive, make_pass(balance_card(), files=pass_assets))
+    changes = diff_passes(
+        state, make_pass(balance_card(balance="30"), files=pass_assets)
+    )
+    assert changes.change_messages == ["Balance is now 30"]
@@ -0,0 +1,94 @@
+import math
+import random
+
+from wallet.PassStyles import StoreCard
+from wallet.Pass import Pass
+from wallet.PassProps import IBeacon, Location
+from wallet.Relevance import StoreIndex
+from wallet.Relevance.StoreIndex import EARTH_RADIUS
+from pytest import approx, importorskip, raises
+
+rng = random.Random(42)
+stores = [
+    Location(
+        latitude=rng.uniform(-89, 89),
+        longitude=rng.uniform(-180, 180),
+        relevant_text=f"Store {i}",
+    )
+    for i in range(2000)
+]
+holders = [(rng.uniform(-90, 90), rng.uniform(-180, 180)) for _ in range(50)]
+holders += [(0.0, 179.99), (89.9, 0.0), (-90.0, 0.0)]
+index = StoreIndex(stores)
+
+
+def haversine(latitude, longitude, location):
+    lat1, lat2 = math.radians(latitude), math.radians(location.latitude)
+    dlat = lat2 - lat1
+    dlon = math.radians(location.longitude - longitude)
+    a = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS * math.asin(math.sqrt(a))
+
+
+def brute_force(latitude, longitude, count):
+    distances = sorted(
+        (haversine(latitude, longitude, store), i) for i, store in enumerate(stores)
+    )
+    return [i for _, i in distances[:count]], [d for d, _ in distances[:count]]
+
+
+def test_nearest_matches_brute_force():
+    for latitude, longitude in holders:
+        nearest = index.nearest(latitude, longitude, 10)
+        expected, distances = brute_force(latitude, longitude, 10)
+        assert [i for i, _ in nearest] == expected
+        assert [d for _, d in nearest] == approx(distances, rel=1e-6)
+
+
+def test_max_distance():
+    nearest = index.nearest(52.5, 13.4, 10, max_distance=500_000)
+    assert all(distance <= 500_000 for _, distance in nearest)
+    assert len(nearest) < 10
+
+
+def test_nearest_many_numpy_matches_tree():
+    importorskip("numpy")
+    tree = index.nearest_many(holders, 10, use_numpy=False)
+    vectorized = index.nearest_many(holders, 10, use_numpy=True)
+    assert [[i for i, _ in r] for r in vectorized] == [[i for i, _ in r] for r in tree]
+    limited = index.nearest_many(holders, 10, max_distance=500_000, use_numpy=True)
+    assert limited == [
+        [(i, approx(d, rel=1e-6)) for i, d in r]
+        for r in index.nearest_many(holders, 10, max_distance=500_000, use_numpy=False)
+    ]
+
+
+def test_fill_passes():
+    beacon_index = StoreIndex(
+        stores[:3],
+        [[IBeacon(proximity_uuid=f"uuid-{i}", major=i, minor=j) for j in range(4)] for i in range(3)],
+    )
+    passes = [
+        Pass(StoreCard(), "pass_type_identifier", "team_identifier", "organization_name")
+        for _ in range(2)
+    ]
+    beacon_index.fill_many(
+        passes,
+        [(0, 0), (10, 10)],
+        relevant_text=lambda store: f"{store.relevantText} is nearby",
+        use_numpy=False,
+    )
+    data = passes[0].json_dict()
+    assert len(data["locations"]) == 3
+    assert data["locations"][0]["relevantText"].endswith("is nearby")
+    assert stores[0].relevantText == "Store 0"
+    assert len(data["ibeacons"]) == 10
+    assert {b["relevantText"] for b in data["ibeacons"]} <= {
+        loc["relevantText"] for loc in data["locations"]
+    }
+    assert data["ibeacons"][0]["relevantText"].endswith("is nearby")
+    assert beacon_index.ibeacons[0][0].relevantText == ""
+    with raises(ValueError):
+        beacon_index.fill(passes[0], 0, 0, count=11)
+    with raises(ValueError):
+        beacon_index.fill_many(passes, [(0, 0), (10, 10)], count=11)
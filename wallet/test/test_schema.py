@@ -0,0 +1,102 @@
+from wallet.PassStyles import BoardingPass, StoreCard
+from wallet.PassProps import Barcode, BarcodeFormat, Location
+from wallet.Schemas import get_schema
+from wallet.Schemas.FieldProps import FieldProps
+from wallet.exceptions import PassValidationException, PassParameterException
+from pytest import raises
+
+
+def test_schema_is_compiled_once_per_style():
+    assert get_schema("storeCard") is get_schema("storeCard")
+    assert get_schema("storeCard") is not get_schema("boardingPass")
+
+
+def test_valid_pass(make_pass):
+    card = StoreCard()
+    card.add_primary_field(FieldProps(key="balance", value="10"))
+    pass_file = make_pass(
+        card,
+        background_color="rgb(38, 93, 205)",
+        barcodes=[Barcode("123")],
+        locations=[Location(latitude=52.5, longitude=13.4)],
+    )
+    assert pass_file.json_dict()["storeCard"]["primaryFields"][0]["key"] == "balance"
+
+
+def test_all_violations_reported_at_once(make_pass):
+    card = StoreCard()
+    card.add_primary_field(FieldProps(key="balance", value="10"))
+    card.add_primary_field(FieldProps(key="points", value="20"))
+    for key in ["a", "b", "c", "balance"]:
+        card.add_secondary_field(FieldProps(key=key, value="x"))
+    card.add_auxiliary_field(FieldProps(key="d", value="x"))
+    pass_file = make_pass(
+        card,
+        background_color="rgb(300, 0, 0)",
+        foreground_color="#ffffff",
+        barcodes=[Barcode("123")],
+        locations=[Location(latitude=1, longitude=1)] * 11,
+        web_service_url="https://example.com",
+    )
+    with raises(PassValidationException) as error:
+        pass_file.json_dict()
+    assert error.value.errors == [
+        "Field storeCard.primaryFields has more than 1 entries",
+        "Field key balance is not unique",
+        "Field backgroundColor is not a valid rgb() color",
+        "Field foregroundColor is not a valid rgb() color",
+        "Field locations has more than 10 entries",
+        "Field storeCard has more than 4 secondary and auxiliary fields combined",
+        "Field webServiceURL requires authenticationToken",
+    ]
+    assert isinstance(error.value, PassParameterException)
+
+
+def test_combined_limit_only_with_square_barcode(make_pass):
+    card = StoreCard()
+    for key in ["a", "b", "c"]:
+        card.add_secondary_field(FieldProps(key=key, value="x"))
+    for key in ["d", "e"]:
+        card.add_auxiliary_field(FieldProps(key=key, value="x"))
+    pass_file = make_pass(card, barcodes=[Barcode("123", BarcodeFormat.PDF417)])
+    assert len(pass_file.json_dict()["storeCard"]["auxiliaryFields"]) == 2
+
+    pass_file.barcodes.append(Barcode("123", BarcodeFormat.CODE128))
+    assert pass_file.json_dict()["barcodes"][1]["format"] == "PKBarcodeFormatCode128"
+
+    pass_file.barcodes.append(Barcode("123", BarcodeFormat.AZTEC))
+    with raises(PassValidationException) as error:
+        pass_file.json_dict()
+    assert error.value.errors == [
+        "Field storeCard has more than 4 secondary and auxiliary fields combined"
+    ]
+
+
+def test_required_fields():
+    errors = get_schema("storeCard").errors({"storeCard": {}})
+    assert errors == [
+        "Field description missing",
+        "Field formatVersion missing",
+        "Field organizationName missing",
+        "Field passTypeIdentifier missing",
+        "Field serialNumber missing",
+        "Field teamIdentifier missing",
+    ]
+
+
+def test_boarding_pass_limits(make_pass):
+    card = BoardingPass(transitType="PKTransitTypeRocket")
+    card.add_primary_field(FieldProps(key="from", value="TXL"))
+    card.add_primary_field(FieldProps(key="to", value="JFK"))
+    pass_file = make_pass(card)
+    with raises(PassValidationException) as error:
+        pass_file.json_dict()
+    assert error.value.errors == ["Field boardingPass.transitType is invalid"]
+
+
+def test_validation_can_be_skipped(make_pass):
+    pass_file = make_pass(
+        StoreCard(), locations=[Location(latitude=1, longitude=1)] * 11
+    )
+    assert len(pass_file.json_dict(validate=False)["locations"]) == 11
+    assert pass_file._create_pass_json(validate=False)
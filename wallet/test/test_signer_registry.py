@@ -0,0 +1,163 @@
+import os
+import zipfile
+from datetime import datetime, timedelta, timezone
+
+from wallet.PassStyles import StoreCard
+from wallet.Pass import Pass
+from wallet.Signing import (
+    OpenSSLSigner,
+    Signer,
+    SignerRegistry,
+    get_default_registry,
+)
+from wallet.exceptions import PassSigningException
+from pytest import importorskip, raises
+
+NOW = 1_700_000_000.0
+
+
+class FakeSigner(Signer):
+    def __init__(self, name, expires=None):
+        self.name = name
+        self.closed = False
+        if expires is not None:
+            self.not_valid_after = expires
+
+    def sign(self, manifest, signing_time=None):
+        return self.name.encode()
+
+    def close(self):
+        self.closed = True
+
+
+class Clock:
+    def __init__(self):
+        self.now = NOW
+
+    def __call__(self):
+        return self.now
+
+
+def make_registry(**kwargs):
+    loads = []
+    clock = Clock()
+    registry = SignerRegistry(clock=clock, **kwargs)
+
+    def loader(name, expires=None):
+        def load():
+            loads.append(name)
+            return FakeSigner(name, expires)
+
+        return load
+
+    return registry, loads, clock, loader
+
+
+def test_lazy_loading_and_lru_eviction():
+    registry, loads, _, loader = make_registry(max_signers=2)
+    for name in ("a", "b", "c"):
+        registry.register(f"pass.{name}", loader(name))
+    assert loads == []
+    a = registry.signer_for("pass.a")
+    assert registry.signer_for("pass.a") is a
+    registry.signer_for("pass.b")
+    registry.signer_for("pass.a")
+    registry.signer_for("pass.c")
+    assert loads == ["a", "b", "c"]
+    assert len(registry) == 2
+    registry.signer_for("pass.a")
+    registry.signer_for("pass.b")
+    assert loads == ["a", "b", "c", "b"]
+    with raises(PassSigningException):
+        registry.signer_for("pass.unknown")
+
+
+def test_idle_eviction():
+    registry, loads, clock, loader = make_registry(idle_timeout=60)
+    registry.register("pass.a", loader("a"))
+    signer = registry.signer_for("pass.a")
+    clock.now += 61
+    assert registry.signer_for("pass.a") is not signer
+    assert signer.closed
+    assert loads == ["a", "a"]
+
+
+def test_leased_signer_is_closed_after_use():
+    registry, loads, clock, loader = make_registry(max_signers=1, idle_timeout=60)
+    registry.register("pass.a", loader("a"))
+    registry.register("pass.b", loader("b"))
+    with registry.lease("pass.a") as signer:
+        # Evicted from the LRU cache while in use
+        registry.signer_for("pass.b")
+        assert len(registry) == 1
+        assert not signer.closed
+        assert signer.sign(b"{}") == b"a"
+    assert signer.closed
+
+    with registry.lease("pass.b") as signer:
+        clock.now += 61
+        with registry.lease("pass.b") as renewed:
+            assert renewed is not signer
+        assert not signer.closed
+    assert signer.closed
+    assert loads == ["a", "b", "b"]
+
+
+def test_rotation_on_disk(tmp_path):
+    registry, loads, clock, loader = make_registry(check_interval=5)
+    key = tmp_path / "key.pem"
+    key.write_text("old")
+    registry.register("pass.a", loader("a"), watch=[str(key)])
+    signer = registry.signer_for("pass.a")
+    key.write_text("rotated")
+    os.utime(key, ns=(0, 0))
+    assert registry.signer_for("pass.a") is signer
+    clock.now += 5
+    assert registry.signer_for("pass.a") is not signer
+    assert signer.closed
+    assert loads == ["a", "a"]
+
+
+def test_expiry_and_team_identifier():
+    registry, _, _, loader = make_registry(expiry_margin=timedelta(days=7))
+    expires = datetime.fromtimestamp(NOW, timezone.utc) + timedelta(days=3)
+    registry.register("pass.a", loader("a", expires), team_identifier="TEAM")
+    with raises(PassSigningException) as error:
+        registry.signer_for("pass.a")
+    assert "expires" in str(error.value)
+    registry.register("pass.b", loader("b"), team_identifier="TEAM")
+    assert registry.signer_for("pass.b", "TEAM").name == "b"
+    with raises(PassSigningException):
+        registry.signer_for("pass.b", "OTHER")
+
+
+def test_expiry_of_openssl_signer(certificate):
+    cert, key = certificate
+    registry = SignerRegistry(expiry_margin=timedelta(days=7))
+    registry.register("pass.a", lambda: OpenSSLSigner(cert, key, cert))
+    with raises(PassSigningException) as error:
+        registry.signer_for("pass.a")
+    assert "expires" in str(error.value)
+
+
+def test_pass_create_picks_signer(certificate):
+    importorskip("cryptography")
+    cert, key = certificate
+    registry = SignerRegistry()
+    registry.register_files(
+        "pass.com.example", cert, key, cert, team_identifier="team_identifier"
+    )
+    pass_file = Pass(
+        StoreCard(), "pass.com.example", "team_identifier", "organization_name"
+    )
+    archive = zipfile.ZipFile(pass_file.create(signer=registry))
+    assert archive.read("signature")
+
+    default = get_default_registry()
+    default.register("pass.com.example", lambda: FakeSigner("default"))
+    try:
+        archive = zipfile.ZipFile(pass_file.create())
+        assert archive.read("signature") == b"default"
+    finally:
+        default.unregister("pass.com.example")
+    assert "pass.com.example" not in default
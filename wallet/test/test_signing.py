@@ -0,0 +1,237 @@
+import glob
+import os
+import shutil
+import subprocess
+import threading
+import zipfile
+from datetime import datetime, timezone
+from importlib.util import find_spec
+
+from wallet.PassStyles import StoreCard
+from wallet.Pass import Pass
+from wallet.Signing import (
+    InMemorySigner,
+    KeyFileSigner,
+    OpenSSLSigner,
+    SessionPool,
+    Signer,
+    build_signed_data,
+)
+from wallet.exceptions import PassParameterException, PassSigningException
+from pytest import importorskip, raises, skip
+
+manifest = b'{"pass.json": "3642041e506fd6a623a0bb00eb4fb8584e0264f9"}'
+SIGNING_TIME = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def verify(signature, cert, tmp_path, content=manifest):
+    (tmp_path / "signature").write_bytes(signature)
+    (tmp_path / "manifest.json").write_bytes(content)
+    subprocess.run(
+        [
+            "openssl", "smime", "-verify", "-binary", "-inform", "DER",
+            "-in", str(tmp_path / "signature"),
+            "-content", str(tmp_path / "manifest.json"),
+            "-CAfile", cert, "-purpose", "any", "-out", os.devnull,
+        ],
+        check=True,
+        capture_output=True,
+    )
+
+
+def read(path):
+    with open(path, "rb") as file_handle:
+        return file_handle.read()
+
+
+def test_openssl_signer(certificate, tmp_path):
+    cert, key = certificate
+    signer = OpenSSLSigner(cert, key, cert)
+    verify(signer.sign(manifest), cert, tmp_path)
+    if find_spec("cryptography"):
+        expected = InMemorySigner(read(cert), read(key), read(cert)).not_valid_after
+        assert signer.not_valid_after == expected
+    if find_spec("asn1crypto"):
+        pinned = signer.sign(manifest, signing_time=SIGNING_TIME)
+        verify(pinned, cert, tmp_path)
+        assert pinned == signer.sign(manifest, signing_time=SIGNING_TIME)
+    with raises(PassSigningException):
+        OpenSSLSigner(cert, "missing.pem", cert).sign(manifest)
+
+
+def test_signer_must_implement_sign():
+    class Incomplete(Signer):
+        pass
+
+    with raises(TypeError):
+        Incomplete()
+
+
+def test_in_memory_signer(certificate, tmp_path):
+    importorskip("cryptography")
+    cert, key = certificate
+    signer = InMemorySigner(read(cert), read(key), read(cert))
+    verify(signer.sign(manifest), cert, tmp_path)
+    pinned = signer.sign(manifest, signing_time=SIGNING_TIME)
+    verify(pinned, cert, tmp_path)
+    assert pinned == signer.sign(manifest, signing_time=SIGNING_TIME)
+
+
+def test_encrypted_key_file_signer(certificate, encrypted_key, tmp_path):
+    importorskip("cryptography")
+    cert, _ = certificate
+    signer = KeyFileSigner(cert, encrypted_key, cert, password="secret")
+    verify(signer.sign(manifest), cert, tmp_path)
+
+
+def test_build_signed_data(certificate, tmp_path):
+    importorskip("asn1crypto")
+    importorskip("cryptography")
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import padding
+
+    cert, key = certificate
+    private_key = serialization.load_pem_private_key(read(key), None)
+
+    def sign(data):
+        return private_key.sign(data, padding.PKCS1v15(), hashes.SHA256())
+
+    for signing_time in (None, SIGNING_TIME, datetime(2051, 1, 1)):
+        signature = build_signed_data(
+            manifest, read(cert), [read(cert)], sign, signing_time
+        )
+        verify(signature, cert, tmp_path)
+    assert signature == build_signed_data(
+        manifest, read(cert), [read(cert)], sign, datetime(2051, 1, 1)
+    )
+
+
+def test_pass_create_with_signer(certificate):
+    importorskip("cryptography")
+    cert, key = certificate
+    pass_file = Pass(
+        StoreCard(), "pass.com.example", "team_identifier", "organization_name"
+    )
+    signer = InMemorySigner(read(cert), read(key), read(cert))
+    archive = zipfile.ZipFile(pass_file.create(signer=signer))
+    assert archive.read("signature")
+    with raises(PassParameterException):
+        pass_file.create()
+
+
+def test_contents_are_signed_in_memory(certificate, tmp_path, monkeypatch):
+    importorskip("cryptography")
+    import tempfile
+
+    def no_tempfiles(*args, **kwargs):
+        raise AssertionError("key written to a temporary file")
+
+    monkeypatch.setattr(tempfile, "NamedTemporaryFile", no_tempfiles)
+    cert, key = certificate
+    pass_file = Pass(
+        StoreCard(), "pass.com.example", "team_identifier", "organization_name"
+    )
+    archive = zipfile.ZipFile(
+        pass_file.create(
+            read(cert).decode(), read(key).decode(), read(cert).decode(),
+            filemode=False,
+        )
+    )
+    verify(
+        archive.read("signature"), cert, tmp_path, archive.read("manifest.json")
+    )
+
+
+def test_session_pool():
+    opened, closed = [], []
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def factory():
+        opened.append(object())
+        return opened[-1]
+
+    pool = SessionPool(factory, size=2, close=closed.append)
+
+    def work():
+        for _ in range(20):
+            with pool.acquire():
+                with lock:
+                    active.append(1)
+                    peak.append(len(active))
+                with lock:
+                    active.pop()
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(opened) <= 2 and max(peak) <= 2
+
+    with raises(ValueError):
+        with pool.acquire():
+            raise ValueError()
+    assert len(closed) == 1
+    pool.close()
+    assert pool.open_sessions == 0
+
+
+def test_session_pool_close_with_borrowed_session():
+    closed = []
+    pool = SessionPool(object, size=2, close=closed.append)
+    with pool.acquire() as session:
+        pool.close()
+        assert closed == []
+    assert closed == [session]
+    assert pool.open_sessions == 0
+    with raises(RuntimeError):
+        with pool.acquire():
+            pass
+
+
+def test_session_pool_timeout():
+    pool = SessionPool(object, size=1, timeout=0.01)
+    with pool.acquire():
+        with raises(TimeoutError):
+            with pool.acquire():
+                pass
+
+
+SOFTHSM_MODULES = [
+    os.environ.get("SOFTHSM2_MODULE", ""),
+    "/usr/lib/softhsm/libsofthsm2.so",
+    "/usr/lib/x86_64-linux-gnu/softhsm/libsofthsm2.so",
+    "/usr/local/lib/softhsm/libsofthsm2.so",
+]
+
+
+def test_pkcs11_signer_with_softhsm(certificate, tmp_path, monkeypatch):
+    importorskip("pkcs11")
+    importorskip("asn1crypto")
+    module = next((m for m in SOFTHSM_MODULES if m and glob.glob(m)), None)
+    if module is None or shutil.which("softhsm2-util") is None:
+        skip("SoftHSM is not installed")
+    from wallet.Signing import PKCS11Signer
+
+    cert, key = certificate
+    (tmp_path / "tokens").mkdir()
+    (tmp_path / "softhsm2.conf").write_text(
+        f"directories.tokendir = {tmp_path / 'tokens'}\n"
+    )
+    monkeypatch.setenv("SOFTHSM2_CONF", str(tmp_path / "softhsm2.conf"))
+    for command in (
+        ["--init-token", "--free", "--label", "wallet", "--pin", "1234",
+         "--so-pin", "5678"],
+        ["--import", key, "--token", "wallet", "--label", "pass-key",
+         "--id", "01", "--pin", "1234"],
+    ):
+        subprocess.run(["softhsm2-util", *command], check=True, capture_output=True)
+
+    with PKCS11Signer(
+        module, "wallet", "1234", "pass-key", read(cert), read(cert), pool_size=2
+    ) as signer:
+        verify(signer.sign(manifest), cert, tmp_path)
+        verify(signer.sign(manifest, signing_time=SIGNING_TIME), cert, tmp_path)
+        assert signer.not_valid_after == OpenSSLSigner(cert, key, cert).not_valid_after
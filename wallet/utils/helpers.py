@@ -0,0 +1,16 @@
+from uuid import NAMESPACE_URL, UUID, uuid5
+
+
+def generate_serial_number(
+    pass_type_identifier: str, *parts: str, namespace: UUID = NAMESPACE_URL
+) -> str:
+    """
+    Create a reproducible serial number, the same pass type identifier
+    and parts always give the same serial
+
+    :param pass_type_identifier: Pass type identifier of the pass
+    :param parts: Values identifying the pass, e.g. a customer id
+    :param namespace: uuid5 namespace
+    """
+    name = "/".join((pass_type_identifier,) + tuple(str(p) for p in parts))
+    return str(uuid5(namespace, name))